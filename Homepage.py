@@ -1,265 +1,51 @@
-import streamlit as st
-import pandas as pd
+import os
 import re
-import io
+import uuid
 import zipfile
-from datetime import datetime,timezone,timedelta
 
-# Get the current date and time
-now_utc = datetime.now(timezone.utc)         # current UTC time
-now = now_utc.astimezone(timezone(timedelta(hours=7))) #WIB
+import pandas as pd
+import streamlit as st
 
-# Format the date and time to display only until minutes
-formatted_datetime = now.strftime("%Y-%m-%d %H:%M")
+from zoom_cleaner import (
+    DEFAULT_EXCLUDED,
+    NULL_METRICS,
+    AttendanceStore,
+    BatchJob,
+    ExclusionMatcher,
+    Metrics,
+    SharedResultCache,
+    available_engines,
+    build_zip,
+    file_content_key,
+    column_values,
+    filter_rows,
+    page_count,
+    page_of,
+    report_timestamp,
+    zip_entry,
+)
+
+# Format the date and time to display only until minutes (WIB)
+formatted_datetime = report_timestamp()
 
 
 st.set_page_config(page_title="Zoom Data Cleaner", layout="wide")
 st.title("Zoom Data Cleaner")
 
-
-# -----------------------------
-# FUNCTIONS
-# -----------------------------
-def count_webinar_participant(file):
-    # Reset file pointer
-    file.seek(0)
-    lines = file.readlines()
-    file.seek(0)
-
-    # Find header row
-    header_row = None
-    for i, line in enumerate(lines):
-        if b"User Name (Original Name)" in line:
-            header_row = i
-            break
-
-    if header_row is None:
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-    # Topic
-    file.seek(0)
-    topic_df = pd.read_csv(file, skiprows=2, nrows=1)
-    try :
-        Topic = topic_df['Topic'].iloc[0].replace('iBlooming: ', "")
-    except :
-        Topic = topic_df['Topic'].iloc[0]
-        
-    # Read actual table
-    file.seek(0)
-    df_webinar = pd.read_csv(file, skiprows=header_row)
-
-    # Take latest time as date
-    Date = df_webinar['Join Time'].iloc[-1][0:10]
-
-    # Find attendee section
-    attendee_idx = df_webinar[df_webinar['Attended']=="Attendee Details"].index
-    if len(attendee_idx) == 0:
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-    # Panelists section
-    df_panelist = df_webinar.iloc[2:int(attendee_idx[0])]
-    df_panelist = df_panelist.drop_duplicates(subset=["Email"])
-    df_panelist["Role"] = "Panelist"
-
-    # Attendees section
-    df_attendee = df_webinar.iloc[int(attendee_idx[0])+2:]
-    duplicated_mask = df_attendee.drop(
-        columns=['User Name (Original Name)','Attended','Join Time','Leave Time',
-                 'Time in Session (minutes)','Is Guest','Country/Region Name'],
-        errors="ignore"
-    ).duplicated()
-    df_attendee_clean = df_attendee[~duplicated_mask].copy()
-    df_attendee_clean["Role"] = "Attendee"
-
-    # Merge both
-    df_clean = pd.concat([df_panelist, df_attendee_clean], ignore_index=True)
-
-    # Counts
-    total_panelist = (df_clean["Role"]=="Panelist").sum()
-    total_attendee = (df_clean["Role"]=="Attendee").sum()
-    duplicated_data = df_attendee.duplicated().sum()
-
-    # Country pivot
-    df_country = df_clean[['Email','Country/Region Name']].dropna()
-    df_t = df_country.pivot_table(
-        index=[],
-        columns="Country/Region Name",
-        values="Email",
-        aggfunc="count",
-        fill_value=0
+@st.cache_resource
+def shared_cache():
+    """Parsed per-file results for every session of this server, keyed by
+    file content + parameters, so the same export is only parsed once."""
+    return SharedResultCache(
+        max_bytes=int(os.environ.get("ZOOM_CLEANER_CACHE_MB", 1024)) << 20,
+        session_bytes=int(os.environ.get("ZOOM_CLEANER_SESSION_CACHE_MB", 256)) << 20,
     )
-    df_t.columns.name = None
-    df_t['Date'] = Date
-    df_t['Topic'] = Topic
-    df_t = df_t[['Date','Topic'] + [c for c in df_t.columns if c not in ['Date','Topic']]]
-
-    # Summary
-    new_data = pd.DataFrame([{
-        "Date": Date,
-        "Topic": Topic,
-        "Total_Attendee": total_attendee,
-        "Total_Panelist": total_panelist,
-        "Total_All": total_attendee + total_panelist,
-        "Row_Deleted": duplicated_data,
-        "Type": "Webinar"
-    }])
-
-    return new_data, df_clean, df_t
-
-
-def count_meeting_participant(file, excluded_name):
-    file.seek(0)
-    lines = file.readlines()
-    file.seek(0)
-
-    # Find header row
-    header_row = None
-    for i, line in enumerate(lines):
-        if b"Name (original name)" in line:
-            header_row = i
-            break
-
-    if header_row is None:
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-    # Read dataframe starting from header row
-    file.seek(0)
-    df_meeting = pd.read_csv(file, skiprows=header_row)
-
-    # Topic
-    file.seek(0)
-    Topic = pd.read_csv(file, nrows=1).iloc[0,0]
-
-    # Date from "Start time"
-    file.seek(0)
-    df_meta = pd.read_csv(file)
-    Date = pd.to_datetime(df_meta['Start time'].astype('datetime64[ns]')[0]).strftime("%Y-%m-%d")
-
-    # Clean data
-    df_meeting_clean = df_meeting[['Name (original name)','Total duration (minutes)']].drop_duplicates()
-
-    # Panelist vs Attendee
-    if excluded_name.strip():
-        df_meeting_clean['Role'] = df_meeting_clean['Name (original name)'].apply(
-            lambda x: "Panelist" if re.search(excluded_name, str(x), flags=re.IGNORECASE) else "Attendee"
-        )
-    else:
-        df_meeting_clean['Role'] = "Attendee"
-
-    # Counts
-    total_panelist = (df_meeting_clean['Role']=="Panelist").sum()
-    total_attendee = (df_meeting_clean['Role']=="Attendee").sum()
-    duplicated_data = df_meeting[['Name (original name)','Total duration (minutes)']].duplicated().sum()
-
-    # Fake country pivot (all 0)
-    df_t = pd.DataFrame([{"Date": Date, "Topic": Topic}])
-
-    # Summary
-    new_data = pd.DataFrame([{
-        "Date": Date,
-        "Topic": Topic,
-        "Total_Attendee": total_attendee,
-        "Total_Panelist": total_panelist,
-        "Total_All": total_attendee + total_panelist,
-        "Row_Deleted": duplicated_data,
-        "Type": "Meeting"
-    }])
-
-    return new_data, df_meeting_clean, df_t
-
-
-def clean_email_level(file):
-    """Build attendee-level CSV (unique per Email–Topic–Date) from webinar files,
-    including both Panelists and Attendees.
-    """
-    # Detect header
-    file.seek(0)
-    lines = file.readlines()
-    file.seek(0)
-    header_row = None
-    for i, line in enumerate(lines):
-        if b"User Name (Original Name)" in line:
-            header_row = i
-            break
-    if header_row is None:
-        return pd.DataFrame()
-
-    # Full table
-    file.seek(0)
-    df = pd.read_csv(file, skiprows=header_row)
-
-    # Topic
-    file.seek(0)
-    topic_df = pd.read_csv(file, skiprows=2, nrows=1)
-    Topic = topic_df['Topic'].iloc[0].replace('iBlooming: ', "")
-
-    # Sections
-    attendee_anchor = df[df['Attended'] == "Attendee Details"]
-    if attendee_anchor.empty:
-        return pd.DataFrame()
-
-    attendee_idx = int(attendee_anchor.index[0])
 
-    # -----------------------------
-    # Panelists
-    # -----------------------------
-    df_panelist = df.iloc[2:attendee_idx].copy()
-    if not df_panelist.empty and "Email" in df_panelist.columns:
-        df_panelist = df_panelist.drop_duplicates(subset=["Email"])
-        keep_cols = ["User Name (Original Name)", "Email"]
-        if "Country/Region Name" in df_panelist.columns:
-            keep_cols.append("Country/Region Name")
-        df_panelist = df_panelist[keep_cols].copy()
-        df_panelist["Role"] = "Panelist"
-    else:
-        df_panelist = pd.DataFrame()
 
-    # -----------------------------
-    # Attendees
-    # -----------------------------
-    df_attendee = df.iloc[attendee_idx + 2 :].copy()
-    if df_attendee.empty:
-        return df_panelist
-
-    Date = str(df_attendee['Join Time'].iloc[-1])[:10]
-
-    dedup_mask = df_attendee.drop(
-        columns=[
-            'User Name (Original Name)','Attended','Join Time','Leave Time',
-            'Time in Session (minutes)','Is Guest','Country/Region Name'
-        ],
-        errors="ignore"
-    ).duplicated(keep='first')
-    df_attendee_clean = df_attendee.loc[~dedup_mask].copy()
-
-    keep_cols = ["User Name (Original Name)", "Email"]
-    if "Country/Region Name" in df_attendee_clean.columns:
-        keep_cols.append("Country/Region Name")
-    df_attendee_clean = df_attendee_clean[keep_cols].copy()
-    df_attendee_clean["Role"] = "Attendee"
-
-    # -----------------------------
-    # Merge Both
-    # -----------------------------
-    out = pd.concat([df_panelist, df_attendee_clean], ignore_index=True)
-
-    if out.empty:
-        return pd.DataFrame()
-
-    out["Topic"] = Topic
-    out["Date"] = Date
-
-    # Ensure proper column order
-    col_order = [
-        "User Name (Original Name)", "Email", "Country/Region Name",
-        "Role", "Topic", "Date"
-    ]
-    out = out.reindex(columns=col_order)
-
-    # Drop duplicates across Role/Email/Topic/Date
-    out = out.drop_duplicates(subset=["Email", "Role", "Topic", "Date"], keep="first")
-
-    return out
+# What this session stores counts against its own share of the cache
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+result_cache = shared_cache().session(st.session_state.session_id)
 
 
 # -----------------------------
@@ -270,82 +56,277 @@ uploaded_files = st.sidebar.file_uploader(
     type=["csv"], 
     accept_multiple_files=True
 )
+st.sidebar.caption("Export times are read as WIB (UTC+7); dates follow that clock.")
 
 excluded_name = st.sidebar.text_area(
     "User Name to Exclude (Meeting Only)\n(separate with commas)",
-    value='admin, iblooming, interpreter, host'
+    value=DEFAULT_EXCLUDED
+)
+match_mode = st.sidebar.radio(
+    "Exclude match mode",
+    ["keyword", "regex"],
+    format_func=str.capitalize,
+    horizontal=True,
+    help="Keyword: plain text contained in the name. Regex: each entry is a regular expression."
+)
+try:
+    excluded_name = ExclusionMatcher.from_text(excluded_name, mode=match_mode)
+except re.error as e:
+    st.sidebar.error(f"❌ Invalid exclusion pattern: {e}")
+    st.stop()
+
+workers = st.sidebar.number_input(
+    "Parallel workers (processes)",
+    min_value=1,
+    max_value=os.cpu_count() or 1,
+    value=1,
+    help="Clean files in separate processes. Results are merged in upload order."
+)
+
+engine = st.sidebar.selectbox(
+    "Parsing engine",
+    available_engines(),
+    help="Polars parses and deduplicates on every core; results are identical."
 )
-excluded_name = [x.strip() for x in excluded_name.split(",")]
-excluded_name = "|".join(excluded_name)
+
+output_formats = st.sidebar.multiselect(
+    "Output formats",
+    ["csv", "parquet", "feather"],
+    default=["csv"],
+    format_func=str.upper,
+    help="CSV for Excel. Parquet/Feather also include the country table and load much faster into a warehouse."
+)
+
+compresslevel = st.sidebar.slider(
+    "ZIP compression level",
+    min_value=0,
+    max_value=9,
+    value=6,
+    help="0 = no compression (fastest), 9 = smallest download."
+)
+
+streaming = st.sidebar.checkbox(
+    "Low-memory mode (large webinars)",
+    help="Read attendee exports in chunks instead of loading each file whole."
+)
+
+engagement = st.sidebar.checkbox(
+    "Time in session (webinars)",
+    help="Minutes each webinar attendee actually attended. Roughly doubles webinar parsing time."
+)
+
+collect_metrics = st.sidebar.checkbox(
+    "Collect stage timings",
+    help="Record time, rows and peak memory per file and stage. Adds metrics.json to the ZIP; parsing gets slower."
+)
+
+with st.sidebar.expander("History database"):
+    use_store = st.checkbox(
+        "Save results to a local database",
+        help="Upserts summary and email rows into SQLite so past exports don't need re-uploading."
+    )
+    store_path = st.text_input("Database file", value="zoom_history.sqlite", disabled=not use_store)
+    show_history = st.checkbox("Report on full stored history", disabled=not use_store)
+
+data_summary, data_email, data_country, data_engagement = (pd.DataFrame(),) * 4
+metrics = None
+
+
+@st.fragment(run_every=0.5)
+def show_progress(job):
+    """Poll the background job; rerun the whole page once it is done."""
+    if job.finished:
+        st.rerun()
+    st.progress(
+        job.done / job.total if job.total else 0.0,
+        text=f"{job.done}/{job.total} files · {job.rows:,} rows · {job.throughput:,.0f} rows/s"
+    )
+    partial = job.partial_summary()
+    if not partial.empty:
+        st.dataframe(partial)
+
+
+def release_results():
+    """Forget the current job's result and ZIP, and stop charging them."""
+    result_cache.release("result")
+    result_cache.release("zip")
+    st.session_state.pop("held_key", None)
+    st.session_state.pop("zip_cache", None)
+
+
+@st.fragment(run_every=0.5)
+def wait_for(job):
+    """Rerun once a cancelled job has stopped, so a session never runs two."""
+    if job.finished:
+        st.rerun()
+    st.info(f"⏳ Stopping the previous run after {job.current or 'its current file'}…")
+
+
+@st.fragment
+def show_table(df, key):
+    """Filtered, paginated result table; only one page is sent to the browser."""
+    cols = st.columns([2, 1, 1, 2, 2])
+    filters = dict(
+        topics=cols[0].multiselect("Topic", column_values(df, "Topic"), key=f"{key}_topics"),
+        dates=cols[1].multiselect("Date", column_values(df, "Date"), key=f"{key}_dates"),
+        roles=cols[2].multiselect("Role", column_values(df, "Role"), key=f"{key}_roles"),
+        countries=cols[3].multiselect(
+            "Country", column_values(df, "Country/Region Name"), key=f"{key}_countries"
+        ),
+        email=cols[4].text_input("Search email", key=f"{key}_email"),
+    )
+    rows = filter_rows(df, **filters)
+
+    cols = st.columns([1, 1, 4])
+    page_size = cols[0].selectbox("Rows per page", [50, 100, 500, 1000], index=1, key=f"{key}_page_size")
+    pages = page_count(len(rows), page_size)
+    # A new key per filter set sends the pager back to page 1
+    page = cols[1].number_input(
+        f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+        key=f"{key}_page_{hash((repr(filters), page_size))}"
+    )
+    start = (page - 1) * page_size
+    cols[2].caption(f"Rows {min(start + 1, len(rows)):,}–{min(start + page_size, len(rows)):,} of {len(rows):,}")
+    st.dataframe(page_of(rows, page, page_size), hide_index=True)
 
 if uploaded_files:
-    data_summary = pd.DataFrame()
-    data_email = pd.DataFrame()
-    data_country = pd.DataFrame()
-    processed_files = set()   # prevent duplicates
-
-    for file in uploaded_files:
-        filename = file.name
-        if filename in processed_files:
+    # The job survives reruns; it only restarts when its inputs change, and
+    # files it already parsed come straight from the result cache.
+    job_key = (
+        tuple((f.name, getattr(f, "file_id", None)) for f in uploaded_files),
+        excluded_name, int(workers), streaming, engine, engagement, collect_metrics,
+        use_store and store_path
+    )
+    job = st.session_state.get("job")
+    if job is None or job.key != job_key:
+        if job is not None:
+            # Its result and ZIP are dropped; the job itself stops after
+            # its current file and is waited for before the next one starts
+            job.cancel()
+            release_results()
+            if not job.finished:
+                wait_for(job)
+                st.stop()
+        batch = list(uploaded_files)
+        ingest = None
+        if use_store:
+            # Uploads are always processed, so changing an option re-runs
+            # them; upsert replaces their rows once the job finishes.
+            # ingested_file only keeps track of which exports are new.
+            with AttendanceStore(store_path) as store:
+                new_files = [
+                    (key, f.name) for f, key in ((f, file_content_key(f)) for f in batch)
+                    if not store.has_file(key)
+                ]
+            ingest = dict(key=job_key, done=False, files=new_files)
+        st.session_state.ingest = ingest
+        job = BatchJob(
+            batch, excluded_name, key=job_key, workers=int(workers),
+            cache=result_cache, streaming=streaming, engine=engine, engagement=engagement,
+            metrics=Metrics() if collect_metrics else None
+        ).start()
+        st.session_state.job = job
+
+    if not job.finished:
+        show_progress(job)
+        st.stop()
+    if job.error is not None:
+        st.error(f"❌ Processing failed: {job.error}")
+        st.stop()
+
+    data_summary, data_email, data_country, data_engagement, skipped = job.result
+    metrics = job.metrics
+    # The result stays in session state, so it counts against the session's
+    # cache budget; measured once per job
+    if st.session_state.get("held_key") != job.key:
+        result_cache.hold("result", job.result)
+        st.session_state.held_key = job.key
+
+    for filename, reason in skipped:
+        if reason == "duplicate":
             st.sidebar.warning(f"⚠️ Skipped duplicate file: {filename}")
-            continue
-        processed_files.add(filename)
-
-        if "attendee" in filename.lower():
-            result, cleaned, df_t = count_webinar_participant(file)
-            df_email = clean_email_level(file)
-        elif "participants" in filename.lower():
-            result, cleaned, df_t = count_meeting_participant(file, excluded_name)
-            df_email = pd.DataFrame()
+        elif reason == "duplicate content":
+            st.sidebar.warning(f"⚠️ Skipped {filename}: same content as another upload")
+        elif reason == "merged":
+            st.info(f"ℹ️ {filename} is another export of the same session; merged instead of counted twice")
         else:
-            st.warning(f"⚠️ Skipped: {filename} (unknown type)")
-            continue
-
-        if not result.empty:
-            data_summary = pd.concat([data_summary, result], ignore_index=True)
-        if not df_email.empty:
-            data_email = pd.concat([data_email, df_email], ignore_index=True)
-        if not df_t.empty:
-            data_country = pd.concat([data_country, df_t], ignore_index=True)
-
-    if not data_summary.empty:
-        # Merge aggregated country counts
-        if not data_country.empty:
-            data_country = data_country.groupby(["Date","Topic"]).sum().reset_index()
-            data_summary = pd.merge(
-                data_summary,
-                data_country,
-                on=["Date","Topic"],
-                how="left"
-            ).fillna(0)
-
-        st.success("✅ Processing complete!")
-        st.dataframe(data_summary[['Date','Topic','Total_Attendee','Total_Panelist','Total_All','Row_Deleted','Type']])
-        st.text(f"Total Email {data_email.shape[0]}. Exclude Zoom Meeting (Region Not Available)")
-        st.dataframe(data_email)
-        
-        # -----------------------------
-        # Prepare CSVs
-        # -----------------------------
-        # Prepare CSVs with utf-8-sig for Excel safety
-        csv_summary = data_summary.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-        csv_email   = data_email.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-        
-        # Create ZIP
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
-            zip_file.writestr(f"{formatted_datetime}_data_summary.csv", csv_summary)
-            zip_file.writestr(f"{formatted_datetime}_data_email.csv", csv_email)
-        zip_buffer.seek(0)
-        
-        # Download button
-        st.download_button(
-            label="📥 Download Results (ZIP)",
-            data=zip_buffer,
-            file_name=f"{formatted_datetime}_zoom_reports.zip",
-            mime="application/zip"
-        )
-else:
+            st.warning(f"⚠️ Skipped: {filename} (not a recognised Zoom export)")
+
+    shared = result_cache.shared
+    st.sidebar.caption(
+        f"Parsed-file cache: {shared.nbytes / 2**20:,.1f} of {shared.max_bytes / 2**20:,.0f} MB "
+        f"({result_cache.nbytes / 2**20:,.1f} MB from this session, {shared.sessions()} sessions); "
+        f"this session's results: {result_cache.held / 2**20:,.1f} MB"
+    )
+
+timer = metrics or NULL_METRICS
+
+if use_store:
+    ingest = st.session_state.get("ingest") if uploaded_files else None
+    with AttendanceStore(store_path) as store:
+        # Upsert once per finished job, not on every rerun
+        if ingest is not None and ingest["key"] == job.key and not ingest["done"]:
+            store.upsert(data_summary, data_email, data_country)
+            if ingest["files"]:
+                store.mark_files(ingest["files"])
+            ingest["done"] = True
+        if show_history:
+            data_summary, data_email = store.summary(), store.email()
+            data_country = data_engagement = None
+
+if not data_summary.empty:
+    st.success("✅ Processing complete!")
+    summary_columns = ['Date','Topic','Total_Attendee','Total_Panelist','Total_All','Row_Deleted','Type']
+    if "Unique_Attendee" in data_summary.columns:
+        summary_columns += ['Unique_Attendee','New_Attendee','Returning_Attendee']
+        st.metric("Unique attendees across upload", int(data_summary["New_Attendee"].sum()))
+    st.dataframe(data_summary[summary_columns])
+    st.text(f"Total Email {data_email.shape[0]}. Exclude Zoom Meeting (Region Not Available)")
+    show_table(data_email, "email")
+    if data_engagement is not None and not data_engagement.empty:
+        st.subheader("Time in session")
+        st.caption("Minutes attended per webinar attendee; overlapping connections count once.")
+        show_table(data_engagement, "engagement")
+    
+    # -----------------------------
+    # Prepare ZIP
+    # -----------------------------
+    # Built once per result and set of options, not on every widget touch
+    zip_key = (tuple(output_formats or ["csv"]), compresslevel, use_store and show_history and store_path)
+    zip_cache = st.session_state.setdefault("zip_cache", {})
+    if zip_key not in zip_cache:
+        zip_cache.clear()   # only keep the ZIP for the current options
+        with timer.stage("zip", file="(batch)"):
+            zip_buffer = build_zip(
+                data_summary, data_email, formatted_datetime,
+                formats=output_formats or ["csv"], data_country=data_country,
+                data_engagement=data_engagement,
+                compresslevel=compresslevel
+            )
+        if metrics:
+            with zipfile.ZipFile(zip_buffer, "a") as zip_file:
+                zip_file.writestr(zip_entry("metrics.json", compresslevel), metrics.to_json())
+        zip_cache[zip_key] = zip_buffer.getvalue()
+        result_cache.hold("zip", zip_cache[zip_key])
+    zip_data = zip_cache[zip_key]
+
+    if metrics:
+        with st.sidebar.expander("⏱ Stage timings"):
+            st.dataframe(metrics.stage_totals(), hide_index=True)
+            st.dataframe(metrics.to_frame(), hide_index=True)
+    
+    # Download button
+    st.download_button(
+        label="📥 Download Results (ZIP)",
+        data=zip_data,
+        file_name=f"{formatted_datetime}_zoom_reports.zip",
+        mime="application/zip"
+    )
+elif not uploaded_files:
+    job = st.session_state.pop("job", None)
+    if job is not None:
+        job.cancel()
+        release_results()
     st.info("Upload one or more Zoom CSV files to begin.")
 
 st.sidebar.text("""Last Update : 26 Sept 2025
@@ -0,0 +1 @@
+"""Benchmarks for the Zoom cleaners, run with ``python -m benchmarks.run``."""
@@ -0,0 +1,141 @@
+"""Synthetic Zoom exports for benchmarking.
+
+Webinar "attendee" reports get the report preamble, host and panelist
+sections, the "Attendee Details" section and several join/leave rows per
+attendee (reconnects). Meeting "participants" reports get the "Start time"
+metadata block and repeated participant rows, including staff names that
+the default exclusion list matches.
+
+    python -m benchmarks.generate OUT_DIR --rows 100000 --files 10
+"""
+import argparse
+import csv
+import io
+import os
+import random
+from datetime import datetime, timedelta
+
+
+WEBINAR_COLUMNS = [
+    "Attended", "User Name (Original Name)", "Email", "Join Time", "Leave Time",
+    "Time in Session (minutes)", "Is Guest", "Country/Region Name",
+]
+MEETING_COLUMNS = ["Name (original name)", "Email", "Total duration (minutes)", "Guest"]
+COUNTRIES = [
+    "Indonesia", "Malaysia", "Singapore", "Philippines", "Thailand", "Vietnam",
+    "India", "Australia", "Japan", "Korea, Republic of", "China", "Taiwan",
+    "Hong Kong", "United States", "United Kingdom", "Germany", "France",
+    "Netherlands", "Brazil", "Mexico", "Nigeria", "Kenya", "Egypt",
+    "Saudi Arabia", "United Arab Emirates", "Turkey", "Pakistan",
+    "Bangladesh", "Sri Lanka", "Canada",
+]
+STAFF = ["Admin Desk", "iBlooming Support", "Interpreter EN", "Host Team"]
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _session_times(rng, start, reconnects):
+    """Non-decreasing (join, leave) pairs for one attendee."""
+    t = start + timedelta(minutes=rng.randrange(-10, 30))
+    for _ in range(reconnects):
+        join = t
+        leave = join + timedelta(minutes=rng.randrange(1, 90), seconds=rng.randrange(60))
+        yield join, leave
+        t = leave + timedelta(minutes=rng.randrange(0, 5))
+
+
+def webinar_export(rows, seed=0, topic="Benchmark Webinar", start=None, panelists=10):
+    """Webinar attendee report with about ``rows`` attendee rows, as bytes."""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 9, 26, 19, 0)
+    out = io.StringIO()
+    w = csv.writer(out)
+
+    w.writerow(["Attendee Report"])
+    w.writerow(["Report Generated:", (start + timedelta(days=1)).strftime("%m/%d/%Y %I:%M %p")])
+    w.writerow(["Topic", "Webinar ID", "Actual Start Time", "Actual Duration (minutes)", "# Registered", "Unique Viewers"])
+    w.writerow([f"iBlooming: {topic}", f"{rng.randrange(10**10, 10**11)}", start.strftime(TIME_FORMAT), "120", rows, rows])
+
+    w.writerow(["Host Details"])
+    w.writerow(WEBINAR_COLUMNS)
+    w.writerow(["Yes", "Host Team", "host@example.com", (start - timedelta(minutes=15)).strftime(TIME_FORMAT),
+                (start + timedelta(hours=2)).strftime(TIME_FORMAT), "135", "No", "Indonesia"])
+
+    w.writerow(["Panelist Details"])
+    w.writerow(WEBINAR_COLUMNS)
+    for i in range(panelists):
+        for join, leave in _session_times(rng, start, rng.randrange(1, 3)):
+            w.writerow(["Yes", f"Speaker {i}", f"speaker{i}@example.com", join.strftime(TIME_FORMAT),
+                        leave.strftime(TIME_FORMAT), int((leave - join).total_seconds() // 60), "No",
+                        rng.choice(COUNTRIES[:5])])
+
+    w.writerow(["Attendee Details"])
+    w.writerow(WEBINAR_COLUMNS)
+    written = 0
+    person = 0
+    while written < rows:
+        country = COUNTRIES[min(int(rng.expovariate(0.25)), len(COUNTRIES) - 1)]
+        email = f"user{seed}_{person}@mail.example" if rng.random() > 0.02 else ""
+        guest = "Yes" if rng.random() < 0.3 else "No"
+        for join, leave in _session_times(rng, start, min(rng.choice([1, 1, 1, 2, 2, 3, 4]), rows - written)):
+            w.writerow(["Yes", f"Attendee {person}", email, join.strftime(TIME_FORMAT),
+                        leave.strftime(TIME_FORMAT), int((leave - join).total_seconds() // 60), guest,
+                        country if rng.random() > 0.05 else ""])
+            written += 1
+        person += 1
+    return out.getvalue().encode("utf-8")
+
+
+def meeting_export(rows, seed=0, topic="Benchmark Meeting", start=None):
+    """Meeting participants report with ``rows`` participant rows, as bytes."""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 9, 26, 19, 0)
+    out = io.StringIO()
+    w = csv.writer(out)
+
+    w.writerow(["Topic", "ID", "Host", "Duration (minutes)", "Start time", "End time", "User Email", "Participants"])
+    w.writerow([topic, f"{rng.randrange(10**10, 10**11)}", "Host Team", "60",
+                start.strftime("%m/%d/%Y %I:%M:%S %p"), (start + timedelta(hours=1)).strftime("%m/%d/%Y %I:%M:%S %p"),
+                "host@example.com", rows])
+    w.writerow([])
+    w.writerow(MEETING_COLUMNS)
+    people = max(1, rows * 2 // 3)
+    for _ in range(rows):
+        if rng.random() < 0.02:
+            name = rng.choice(STAFF)
+        else:
+            name = f"Participant {rng.randrange(people)}"
+        w.writerow([name, "", rng.choice([5, 15, 30, 45, 60]), "Yes"])
+    return out.getvalue().encode("utf-8")
+
+
+def generate(out_dir, rows, files, kind="both", seed=0):
+    """Write ``files`` exports of about ``rows`` rows each; returns the paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(files):
+        start = datetime(2025, 1, 1, 19, 0) + timedelta(days=i)
+        if kind == "webinar" or (kind == "both" and i % 2 == 0):
+            name, data = f"webinar_{i:04d}_attendee.csv", webinar_export(rows, seed + i, f"Webinar {i}", start)
+        else:
+            name, data = f"meeting_{i:04d}_participants.csv", meeting_export(rows, seed + i, f"Meeting {i}", start)
+        path = os.path.join(out_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic Zoom exports.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per file")
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--kind", choices=["webinar", "meeting", "both"], default="both")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = generate(args.out_dir, args.rows, args.files, args.kind, args.seed)
+    print(f"Wrote {len(paths)} files to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
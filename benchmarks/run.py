@@ -0,0 +1,154 @@
+"""Time and memory-profile the cleaners on synthetic exports.
+
+    python -m benchmarks.run                          # quick default sizes
+    python -m benchmarks.run --rows 1000 100000 1000000 --files 1 100 1000
+    python -m benchmarks.run --json bench.json        # keep results to compare
+
+Per-function cases parse a single in-memory export of each ``--rows`` size.
+The upload-loop cases run ``process_files`` over ``--files`` exports of
+``--loop-rows`` rows each, written to a temporary directory. Time is the
+best of ``--repeat`` runs; memory is the tracemalloc peak of one extra run.
+
+The ``--workers`` pool case runs in a fresh interpreter: once polars has
+been imported here the pool has to spawn its workers instead of forking.
+Its peak is still only the parent's, as tracemalloc cannot see the workers,
+so it is marked ``*`` and is not comparable with the other cases.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from zoom_cleaner import (
+    DEFAULT_EXCLUDED,
+    ExclusionMatcher,
+    available_engines,
+    clean_email_level,
+    count_meeting_participant,
+    count_webinar_participant,
+    parse_webinar_export,
+    process_files,
+    stream_webinar_export,
+)
+from zoom_cleaner.cli import open_inputs
+
+from .generate import generate, meeting_export, webinar_export
+
+
+def measure(fn, repeat):
+    """Return ``(best_seconds, median_seconds, peak_bytes)`` for ``fn()``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), statistics.median(times), peak
+
+
+def _buffer(data):
+    def make():
+        return io.BytesIO(data)
+    return make
+
+
+def function_cases(rows, matcher):
+    webinar = _buffer(webinar_export(rows, seed=rows))
+    meeting = _buffer(meeting_export(rows, seed=rows))
+    yield "count_webinar_participant", lambda: count_webinar_participant(webinar())
+    yield "clean_email_level", lambda: clean_email_level(webinar())
+    yield "parse_webinar_export", lambda: parse_webinar_export(webinar())
+    yield "stream_webinar_export", lambda: stream_webinar_export(webinar())
+    yield "count_meeting_participant", lambda: count_meeting_participant(meeting(), matcher)
+    if "polars" in available_engines():
+        from zoom_cleaner.polars_engine import polars_meeting_export, polars_webinar_export
+        yield "polars_webinar_export", lambda: polars_webinar_export(webinar())
+        yield "polars_meeting_export", lambda: polars_meeting_export(meeting())
+
+
+def loop_cases(paths, matcher):
+    yield "process_files", lambda: process_files(open_inputs(paths), matcher)
+    if "polars" in available_engines():
+        yield "process_files[polars]", lambda: process_files(open_inputs(paths), matcher, engine="polars")
+
+
+def pool_case(paths, workers, repeat):
+    """Measure the process pool in a fresh interpreter, where polars is not
+    loaded and the workers can fork like they do for the CLI."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--pool-case", str(workers), "--repeat", str(repeat), *paths],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def _pool_child(workers, repeat, paths):
+    matcher = ExclusionMatcher.from_text(DEFAULT_EXCLUDED)
+    fn = lambda: process_files(open_inputs(paths), matcher, workers=workers)
+    print(json.dumps(measure(fn, repeat)))
+
+
+def _report(results, name, size, best, median, peak, note=None):
+    results.append({"case": name, "size": size, "best_s": best, "median_s": median, "peak_mb": peak / 2**20,
+                    "note": note})
+    mark = "*" if note else ""
+    print(f"{name:<36} {size:>14} {best * 1000:>10.1f} {median * 1000:>10.1f} {peak / 2**20:>9.1f}{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Zoom cleaners on synthetic exports.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000, 100_000],
+                        help="rows per export for the per-function cases")
+    parser.add_argument("--files", type=int, nargs="+", default=[1, 10, 100],
+                        help="file counts for the upload-loop cases")
+    parser.add_argument("--loop-rows", type=int, default=1000, help="rows per file in the upload-loop cases")
+    parser.add_argument("--workers", type=int, default=1, help="also time the process pool with this many workers")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--pool-case", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.pool_case:
+        return _pool_child(args.pool_case, args.repeat, args.paths)
+
+    matcher = ExclusionMatcher.from_text(DEFAULT_EXCLUDED)
+    results = []
+    print(f"{'case':<36} {'size':>14} {'best ms':>10} {'median ms':>10} {'peak MB':>9}")
+
+    for rows in args.rows:
+        for name, fn in function_cases(rows, matcher):
+            _report(results, name, f"{rows} rows", *measure(fn, args.repeat))
+
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate(tmp, args.loop_rows, files)
+            for name, fn in loop_cases(paths, matcher):
+                _report(results, name, f"{files}x{args.loop_rows}", *measure(fn, args.repeat))
+            if args.workers > 1:
+                _report(results, f"process_files[workers={args.workers}]", f"{files}x{args.loop_rows}",
+                        *pool_case(paths, args.workers, args.repeat), note="parent process only")
+
+    if args.workers > 1:
+        print("* peak of the pool's parent process only; its workers are not traced")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
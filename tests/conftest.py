@@ -0,0 +1,17 @@
+import io
+
+import pytest
+
+from zoom_cleaner import DEFAULT_EXCLUDED, ExclusionMatcher
+
+
+def upload(data, name):
+    """In-memory file named like an upload."""
+    file = io.BytesIO(data)
+    file.name = name
+    return file
+
+
+@pytest.fixture
+def matcher():
+    return ExclusionMatcher.from_text(DEFAULT_EXCLUDED)
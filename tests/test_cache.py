@@ -0,0 +1,57 @@
+from zoom_cleaner.cache import ResultCache, SharedResultCache, result_nbytes
+
+
+KB = b"x" * 1000
+SIZE = result_nbytes(KB)
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+def test_shared_cache_evicts_by_bytes():
+    cache = SharedResultCache(max_bytes=3 * SIZE, session_bytes=10 * SIZE)
+    for key in "abcd":
+        assert cache.put(key, KB)
+    assert "a" not in cache and len(cache) == 3
+    assert cache.nbytes == 3 * SIZE
+
+
+def test_session_evicts_its_own_entries_first():
+    cache = SharedResultCache(max_bytes=10 * SIZE, session_bytes=2 * SIZE)
+    other, mine = cache.session("other"), cache.session("mine")
+    other.put("o1", KB)
+    for key in ("m1", "m2", "m3"):
+        mine.put(key, KB)
+    assert "o1" in cache and "m1" not in cache
+    assert mine.nbytes == 2 * SIZE and cache.sessions() == 2
+    # Lookups see every session's entries
+    assert mine.get("o1") is KB
+
+
+def test_entries_larger_than_the_budget_are_not_kept():
+    cache = SharedResultCache(max_bytes=10 * SIZE, session_bytes=SIZE // 2)
+    assert not cache.session("s").put("big", KB)
+    assert len(cache) == 0
+
+
+def test_held_values_count_against_the_session_budget():
+    cache = SharedResultCache(max_bytes=10 * SIZE, session_bytes=3 * SIZE)
+    session = cache.session("s")
+    for key in ("a", "b", "c"):
+        session.put(key, KB)
+    assert session.hold("result", KB * 2)
+    assert list(cache._entries) == ["c"]
+    assert session.held == result_nbytes(KB * 2)
+
+    assert not session.hold("zip", KB * 3)      # more than the whole budget
+    assert len(cache) == 0 and not session.put("d", KB)
+
+    session.release("zip")
+    session.release("result")
+    assert session.held == 0 and session.put("d", KB)
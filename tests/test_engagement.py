@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from zoom_cleaner.engagement import (
+    attendance_intervals,
+    compact_intervals,
+    concat_intervals,
+    engagement_table,
+)
+
+
+def section(rows):
+    return pd.DataFrame(rows, columns=["User Name (Original Name)", "Email", "Join Time", "Leave Time"])
+
+
+ATTENDEES = section([
+    ["Ann", "ann@example.com", "2025-01-01 10:00:00", "2025-01-01 10:30:00"],
+    ["Ann", "ann@example.com", "2025-01-01 10:20:00", "2025-01-01 10:50:00"],   # second device
+    ["Ann", "ann@example.com", "2025-01-01 11:00:00", "2025-01-01 11:10:00"],
+    ["Bob", np.nan, "2025-01-01 10:05:00", "2025-01-01 10:15:00"],
+    ["Bob", np.nan, "2025-01-01 10:05:00", "2025-01-01 10:15:00"],                # repeated row
+    ["Cid", "cid@example.com", "2025-01-01 10:40:00", "2025-01-01 10:10:00"],     # leaves before joining
+    ["Dee", "dee@example.com", "not a time", "2025-01-01 10:10:00"],
+])
+PANELISTS = section([
+    ["Ann", "ann@example.com", "2025-01-01 09:50:00", "2025-01-01 11:20:00"],
+])
+
+
+def intervals():
+    return concat_intervals([
+        attendance_intervals(PANELISTS, "Panelist"),
+        attendance_intervals(ATTENDEES, "Attendee"),
+    ])
+
+
+def test_attendance_intervals_drops_invalid_rows():
+    assert list(attendance_intervals(ATTENDEES, "Attendee")["User Name (Original Name)"]) == [
+        "Ann", "Ann", "Ann", "Bob", "Bob"
+    ]
+
+
+def test_engagement_table_by_hand():
+    table = engagement_table(intervals(), "Topic", "2025-01-01")
+
+    t = pd.Timestamp
+    expected = pd.DataFrame({
+        "User Name (Original Name)": ["Bob", "Ann", "Ann"],
+        "Email": [np.nan, "ann@example.com", "ann@example.com"],
+        "Role": ["Attendee", "Attendee", "Panelist"],
+        "Topic": "Topic",
+        "Date": "2025-01-01",
+        "First_Join": [t("2025-01-01 10:05"), t("2025-01-01 10:00"), t("2025-01-01 09:50")],
+        "Last_Leave": [t("2025-01-01 10:15"), t("2025-01-01 11:10"), t("2025-01-01 11:20")],
+        # Ann: 10:00-10:50 and 11:00-11:10; Bob's repeated row counts once
+        "Attended_Minutes": [10.0, 60.0, 90.0],
+        "Reconnects": [0, 2, 0],
+    })
+    pd.testing.assert_frame_equal(table, expected, check_dtype=False)
+
+
+def test_compact_intervals_unions_overlaps():
+    blocks = compact_intervals(intervals())
+    ann = blocks[(blocks["Email"] == "ann@example.com") & (blocks["Role"] == "Attendee")]
+    assert list(zip(ann["Join Time"].dt.strftime("%H:%M"), ann["Leave Time"].dt.strftime("%H:%M"), ann["Rows"])) == [
+        ("10:00", "10:50", 2), ("11:00", "11:10", 1)
+    ]
+
+
+def test_compacting_in_pieces_matches_all_at_once():
+    # How the chunked reader folds its (already deduplicated) rows
+    rows = intervals()
+    folded = compact_intervals(concat_intervals([
+        compact_intervals(rows.iloc[:3]), compact_intervals(rows.iloc[3:])
+    ]))
+    pd.testing.assert_frame_equal(folded, compact_intervals(rows))
+    assert engagement_table(folded, "Topic", "2025-01-01").equals(engagement_table(rows, "Topic", "2025-01-01"))
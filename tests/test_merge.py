@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from benchmarks.generate import webinar_export
+from zoom_cleaner import process_files
+
+from .conftest import upload
+
+
+def split_export(data, overlap=0.2):
+    """Two exports of the same webinar whose attendee rows overlap."""
+    lines = data.splitlines(keepends=True)
+    details = next(i for i, line in enumerate(lines) if line.startswith(b"Attendee Details"))
+    head, rows = lines[:details + 2], lines[details + 2:]
+    cut = len(rows) // 2
+    margin = int(len(rows) * overlap / 2)
+    return b"".join(head + rows[:cut + margin]), b"".join(head + rows[cut - margin:])
+
+
+def _sorted(df):
+    df = df.astype(str)
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("engagement", [False, True])
+def test_overlapping_halves_equal_whole_file(matcher, streaming, engagement):
+    data = webinar_export(2000, seed=7)
+    first, second = split_export(data)
+    options = dict(streaming=streaming, engagement=engagement)
+
+    whole = process_files([upload(data, "whole_attendee.csv")], matcher, **options)
+    merged = process_files(
+        [upload(first, "first_attendee.csv"), upload(second, "second_attendee.csv")], matcher, **options
+    )
+
+    assert merged[4] == [("first_attendee.csv", "merged")]
+    # Rows repeated across the two exports are counted as deleted
+    columns = ["Date", "Topic", "Total_Attendee", "Total_Panelist", "Total_All", "Type", "Unique_Attendee"]
+    pd.testing.assert_frame_equal(merged[0][columns], whole[0][columns])
+    pd.testing.assert_frame_equal(_sorted(merged[1]), _sorted(whole[1]))
+    pd.testing.assert_frame_equal(_sorted(merged[2]), _sorted(whole[2]))
+    assert merged[3].empty == (not engagement)
+    if engagement:
+        minutes = ["Email", "Role", "First_Join", "Last_Leave", "Attended_Minutes"]
+        if not streaming:   # blocks no longer know which connections they came from
+            minutes.append("Reconnects")
+        pd.testing.assert_frame_equal(_sorted(merged[3][minutes]), _sorted(whole[3][minutes]))
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from benchmarks.generate import webinar_export
+from zoom_cleaner import AttendanceStore, merge_country_counts, process_files
+
+from .conftest import upload
+
+
+def batch(matcher, *exports):
+    files = [upload(data, f"w{i}_attendee.csv") for i, data in enumerate(exports)]
+    summary, email, country, _, _ = process_files(files, matcher)
+    return merge_country_counts(summary, country), email, country
+
+
+def test_reingesting_replaces_rows(tmp_path, matcher):
+    first = webinar_export(300, seed=1, topic="One")
+    second = webinar_export(300, seed=2, topic="Two")
+
+    with AttendanceStore(tmp_path / "history.sqlite") as store:
+        store.upsert(*batch(matcher, first))
+        store.upsert(*batch(matcher, first, second))
+        store.upsert(*batch(matcher, first))
+        summary, email = store.summary(), store.email()
+
+    live_summary, live_email, _ = batch(matcher, first, second)
+    assert len(summary) == 2 and list(summary["Topic"]) == sorted(live_summary["Topic"])
+    assert len(email) == len(live_email)
+    one = summary[summary["Topic"] == live_summary["Topic"].iloc[0]].iloc[0]
+    assert one["Total_Attendee"] == live_summary["Total_Attendee"].iloc[0]
+    assert one["Indonesia"] == live_summary["Indonesia"].iloc[0]
+
+
+def test_missing_emails_collapse_on_the_key(tmp_path):
+    email = pd.DataFrame({
+        "User Name (Original Name)": ["A", "B"], "Email": [float("nan"), None],
+        "Country/Region Name": ["Indonesia"] * 2, "Role": ["Attendee"] * 2,
+        "Topic": ["T"] * 2, "Date": ["2025-01-01"] * 2,
+    })
+    with AttendanceStore(tmp_path / "history.sqlite") as store:
+        store.upsert(pd.DataFrame(), email)
+        stored = store.email()
+    assert len(stored) == 1 and pd.isna(stored["Email"].iloc[0])
+
+
+def test_ingested_files_are_remembered(tmp_path):
+    path = tmp_path / "history.sqlite"
+    with AttendanceStore(path) as store:
+        store.mark_files([("key", "w0_attendee.csv")])
+    with AttendanceStore(path) as store:
+        assert store.has_file("key") and not store.has_file("other")
@@ -0,0 +1,63 @@
+"""Headless Zoom Data Cleaner: the cleaners and batch helpers used by the app."""
+from .cache import ResultCache, SessionCache, SharedResultCache, content_key, file_content_key, result_nbytes
+from .emails import EmailIndex, normalize_emails
+from .formats import FORMATS, SIGNATURE_BYTES, ExportFormat, detect_format, register_format
+from .timestamps import (
+    REPORT_TZ, ZOOM_TIME_FORMATS, export_date, parse_time, parse_times, session_date, time_format,
+)
+from .engagement import (
+    BLOCK_COLUMNS,
+    ENGAGEMENT_COLUMNS,
+    attendance_intervals,
+    compact_intervals,
+    concat_intervals,
+    engagement_table,
+)
+from .matcher import ExclusionMatcher
+from .core import (
+    DEFAULT_EXCLUDED,
+    ENGINES,
+    MEETING_MARKER,
+    MeetingExport,
+    OUTPUT_FORMATS,
+    ROLES,
+    ResultCollector,
+    WEBINAR_MARKER,
+    as_matcher,
+    available_engines,
+    build_exclusion_pattern,
+    build_zip,
+    categorize,
+    clean_email_level,
+    concat_frames,
+    country_counts,
+    country_long,
+    country_table,
+    count_meeting_participant,
+    count_webinar_participant,
+    export_identity,
+    export_kind,
+    finish_file,
+    meeting_metadata,
+    merge_country_counts,
+    merge_meeting_exports,
+    merge_parsed,
+    merge_webinar_exports,
+    parse_cached,
+    parse_file,
+    parse_meeting_export,
+    parse_webinar_export,
+    process_cached,
+    process_file,
+    process_files,
+    report_timestamp,
+    summarize_meeting,
+    webinar_engagement,
+    zip_entry,
+)
+from .streaming import stream_webinar_export
+from .store import AttendanceStore
+from .jobs import BatchJob, JobCancelled
+from .views import column_values, filter_rows, page_count, page_of
+from .reader import MappedFile, sniff_header
+from .metrics import NULL_METRICS, Metrics
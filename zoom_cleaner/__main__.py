@@ -0,0 +1,5 @@
+from .cli import main
+
+# Guarded so spawned worker processes can import this module
+if __name__ == "__main__":
+    raise SystemExit(main())
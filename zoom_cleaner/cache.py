@@ -0,0 +1,266 @@
+"""In-memory memoization of per-file cleaning results.
+
+:class:`ResultCache` is a plain per-process LRU for one user (the CLI, one
+app session). :class:`SharedResultCache` is shared by every session of a
+Streamlit server: bounded by memory rather than entry count, thread safe,
+and with a per-session budget so one large batch cannot flush everybody
+else's results.
+"""
+import hashlib
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+import pandas as pd
+
+
+BLOCK_SIZE = 1 << 20
+
+
+def _finish_key(digest, params):
+    for param in params:
+        digest.update(b"\0")
+        digest.update(repr(param).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_key(data, *params):
+    """Hash file bytes together with the parameters that affect its result."""
+    return _finish_key(hashlib.sha256(data), params)
+
+
+def file_content_key(file, *params):
+    """Same as :func:`content_key`, reading ``file`` in blocks instead of all at once."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+        digest.update(block)
+    file.seek(0)
+    return _finish_key(digest, params)
+
+
+def result_key(digest, *params):
+    """Key for a result of the file whose :func:`file_content_key` is
+    ``digest``, so files hashed once can be looked up under other params."""
+    return _finish_key(hashlib.sha256(digest.encode("ascii")), params)
+
+
+class ResultCache:
+    """Least-recently-used cache of per-file outputs, bounded by entry count."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (marking it recently used) or ``default``."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def result_nbytes(value):
+    """Estimated memory held by a cached result, counting frames deeply."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(result_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class SharedResultCache:
+    """Least-recently-used cache of per-file outputs shared across sessions.
+
+    Bounded by ``max_bytes`` of estimated memory (see :func:`result_nbytes`).
+    Each entry is charged to the session that stored it; once a session holds
+    more than ``session_bytes``, its own least recently used entries are
+    evicted first. Entries are shared read-only: a session hitting another
+    session's entry gets the same objects. Use :meth:`session` for a
+    per-session view with the :class:`ResultCache` interface.
+
+    What a session keeps outside the cache (its batch result, a built ZIP)
+    can be registered with :meth:`hold`; it counts against that session's
+    budget only, pushing its own entries out first.
+    """
+
+    def __init__(self, max_bytes=1 << 30, session_bytes=256 << 20):
+        self.max_bytes = max_bytes
+        self.session_bytes = session_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()    # key -> (value, nbytes, owner)
+        self._usage = Counter()          # owner -> nbytes
+        self._held = {}                  # owner -> {name: nbytes}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (marking it recently used) or ``default``."""
+        with self._lock:
+            try:
+                value = self._entries[key][0]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, owner=None):
+        """Store ``value`` charged to ``owner``; returns ``False`` if it is too big to keep."""
+        nbytes = result_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            limit = self.max_bytes
+            if owner is not None:
+                limit = min(limit, self.session_bytes - self._held_bytes(owner))
+            if nbytes > limit:
+                return False
+            self._entries[key] = (value, nbytes, owner)
+            self.nbytes += nbytes
+            self._usage[owner] += nbytes
+            self._fit_session(owner)
+            while self.nbytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+            return True
+
+    def hold(self, owner, name, value):
+        """Charge ``value``, kept by ``owner`` outside the cache, to its budget.
+
+        Replaces what was held under ``name`` before and evicts the owner's
+        least recently used entries to make room. Returns ``False`` if the
+        held values alone exceed the budget.
+        """
+        nbytes = result_nbytes(value)
+        with self._lock:
+            self._held.setdefault(owner, {})[name] = nbytes
+            self._fit_session(owner)
+            return self._held_bytes(owner) <= self.session_bytes
+
+    def release(self, owner, name):
+        """Stop charging what ``owner`` held under ``name``."""
+        with self._lock:
+            held = self._held.get(owner, {})
+            held.pop(name, None)
+            if not held:
+                self._held.pop(owner, None)
+
+    def _held_bytes(self, owner):
+        return sum(self._held.get(owner, {}).values())
+
+    def _fit_session(self, owner):
+        if owner is None:
+            return
+        budget = self.session_bytes - self._held_bytes(owner)
+        if self._usage[owner] <= budget:
+            return
+        own = [k for k, entry in self._entries.items() if entry[2] == owner]
+        for k in own:
+            if self._usage[owner] <= budget:
+                break
+            self._discard(k)
+
+    def _discard(self, key):
+        _, nbytes, owner = self._entries.pop(key)
+        self.nbytes -= nbytes
+        self._usage[owner] -= nbytes
+        if not self._usage[owner]:
+            del self._usage[owner]
+
+    def usage(self, owner):
+        """Bytes of cache entries currently charged to ``owner``."""
+        with self._lock:
+            return self._usage.get(owner, 0)
+
+    def held(self, owner):
+        """Bytes ``owner`` holds outside the cache (see :meth:`hold`)."""
+        with self._lock:
+            return self._held_bytes(owner)
+
+    def sessions(self):
+        """Number of sessions with entries in the cache."""
+        with self._lock:
+            return sum(1 for owner in self._usage if owner is not None)
+
+    def session(self, owner):
+        """A view of this cache that charges what it stores to ``owner``."""
+        return SessionCache(self, owner)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._usage.clear()
+            self._held.clear()
+            self.nbytes = 0
+
+
+class SessionCache:
+    """One session's view of a :class:`SharedResultCache`.
+
+    Lookups see every session's entries; stores count against this
+    session's budget. Drop-in for :class:`ResultCache` in
+    :func:`~zoom_cleaner.core.process_files`.
+    """
+
+    def __init__(self, shared, owner):
+        self.shared = shared
+        self.owner = owner
+
+    def __len__(self):
+        return len(self.shared)
+
+    def __contains__(self, key):
+        return key in self.shared
+
+    def get(self, key, default=None):
+        return self.shared.get(key, default)
+
+    def put(self, key, value):
+        return self.shared.put(key, value, self.owner)
+
+    def hold(self, name, value):
+        return self.shared.hold(self.owner, name, value)
+
+    def release(self, name):
+        self.shared.release(self.owner, name)
+
+    @property
+    def nbytes(self):
+        """Bytes this session has stored in the shared cache."""
+        return self.shared.usage(self.owner)
+
+    @property
+    def held(self):
+        """Bytes this session holds outside the cache."""
+        return self.shared.held(self.owner)
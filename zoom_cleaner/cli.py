@@ -0,0 +1,195 @@
+"""Command line entry point: ``python -m zoom_cleaner <dir|glob|file> ...``"""
+import argparse
+import glob
+import os
+import re
+import sys
+import zipfile
+
+from .cache import file_content_key
+from .matcher import MODES, ExclusionMatcher
+from .metrics import NULL_METRICS, Metrics
+from .reader import MappedFile
+from .store import AttendanceStore
+from .core import (
+    DEFAULT_EXCLUDED,
+    ENGINES,
+    OUTPUT_FORMATS,
+    available_engines,
+    build_zip,
+    merge_country_counts,
+    process_files,
+    report_timestamp,
+    zip_entry,
+)
+
+
+def collect_paths(inputs):
+    """Expand directories and glob patterns into a sorted list of CSV paths."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "*.csv"))
+        else:
+            matches = glob.glob(item)
+        paths.extend(sorted(matches))
+    # Keep order but drop repeated paths
+    return list(dict.fromkeys(paths))
+
+
+def open_inputs(paths):
+    """Memory-map every path; close the returned files when done."""
+    return [MappedFile(path) for path in paths]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="zoom_cleaner",
+        description="Clean Zoom attendee/participants CSV exports into a summary/email ZIP.",
+        epilog="Export times are taken as WIB (UTC+7) as written; dates come from that clock.",
+    )
+    parser.add_argument("inputs", nargs="+", help="CSV files, directories or glob patterns")
+    parser.add_argument("-o", "--output", help="ZIP path (default: <timestamp>_zoom_reports.zip)")
+    parser.add_argument(
+        "--exclude",
+        default=DEFAULT_EXCLUDED,
+        help="comma separated user names to exclude (meeting only)",
+    )
+    parser.add_argument(
+        "--exclude-mode",
+        choices=MODES,
+        default="keyword",
+        help="treat --exclude entries as plain keywords or regular expressions",
+    )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "-f", "--format",
+        dest="formats",
+        action="append",
+        choices=sorted(OUTPUT_FORMATS),
+        help="output format inside the ZIP, repeat for several (default: csv)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(10),
+        default=6,
+        metavar="0-9",
+        help="ZIP deflate level, 0 stores entries uncompressed (default: 6)",
+    )
+    parser.add_argument(
+        "--db",
+        help="SQLite file to upsert results into; files already ingested there are skipped",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="with --db, write the ZIP from the whole stored history instead of this batch",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="record per-file stage timings/memory, print totals and add metrics.json to the ZIP",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read webinar exports in chunks to bound memory on very large files",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="pandas",
+        help="parsing backend; polars is multithreaded and needs the optional 'polars' package",
+    )
+    parser.add_argument(
+        "--engagement",
+        action="store_true",
+        help="also write minutes in session per webinar attendee (roughly doubles webinar parse time)",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    paths = collect_paths(args.inputs)
+    if not paths:
+        print("No CSV files found.", file=sys.stderr)
+        return 1
+
+    try:
+        excluded_name = ExclusionMatcher.from_text(args.exclude, mode=args.exclude_mode)
+    except re.error as e:
+        print(f"Invalid exclusion pattern: {e}", file=sys.stderr)
+        return 2
+
+    if args.engine not in available_engines():
+        print(f"The {args.engine} engine is not installed.", file=sys.stderr)
+        return 2
+
+    store = AttendanceStore(args.db) if args.db else None
+    keys = {}
+    if store is not None:
+        for path in paths:
+            with open(path, "rb") as file:
+                keys[path] = file_content_key(file)
+        new_paths = [path for path in paths if not store.has_file(keys[path])]
+        for path in sorted(set(paths) - set(new_paths)):
+            print(f"Skipped: {os.path.basename(path)} (already in {args.db})", file=sys.stderr)
+        paths = new_paths
+
+    metrics = Metrics() if args.metrics else None
+    timer = metrics or NULL_METRICS
+    inputs = open_inputs(paths)
+    try:
+        data_summary, data_email, data_country, data_engagement, skipped = process_files(
+            inputs, excluded_name, workers=args.workers, streaming=args.stream,
+            metrics=metrics, engine=args.engine, engagement=args.engagement,
+        )
+    finally:
+        for file in inputs:
+            file.close()
+
+    for filename, reason in skipped:
+        if reason == "merged":
+            print(f"Merged: {filename} (same session as a later export)", file=sys.stderr)
+        else:
+            print(f"Skipped: {filename} ({reason})", file=sys.stderr)
+
+    with timer.stage("merge", file="(batch)"):
+        data_summary = merge_country_counts(data_summary, data_country)
+
+    if store is not None:
+        with store:
+            store.upsert(data_summary, data_email, data_country)
+            store.mark_files((keys[path], os.path.basename(path)) for path in paths)
+            if args.history:
+                data_summary, data_email = store.summary(), store.email()
+                data_country = data_engagement = None
+
+    if data_summary.empty:
+        print("Nothing to write.", file=sys.stderr)
+        return 1
+
+    formatted_datetime = report_timestamp()
+    output = args.output or f"{formatted_datetime}_zoom_reports.zip"
+    with timer.stage("zip", file="(batch)"), open(output, "wb") as out:
+        build_zip(
+            data_summary, data_email, formatted_datetime,
+            formats=args.formats or ["csv"], data_country=data_country, data_engagement=data_engagement,
+            compresslevel=args.compression_level, file=out,
+        )
+    if metrics:
+        # Appended afterwards so the ZIP stage itself is included
+        with zipfile.ZipFile(output, "a") as zip_file:
+            zip_file.writestr(zip_entry("metrics.json", args.compression_level), metrics.to_json())
+        print(metrics.stage_totals().to_string(index=False), file=sys.stderr)
+
+    print(f"Wrote {output}: {len(data_summary)} sessions, {len(data_email)} emails")
+    return 0
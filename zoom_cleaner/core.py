@@ -0,0 +1,990 @@
+"""Zoom export cleaning core.
+
+Everything here is plain pandas so it can be used from the Streamlit app,
+the command line or a batch worker without importing Streamlit. An optional
+Polars parsing backend lives in :mod:`zoom_cleaner.polars_engine`.
+"""
+import csv
+import importlib.util
+import io
+import multiprocessing
+import os
+import sys
+import zipfile
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime,timezone
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_content_key, result_key
+from .emails import EmailIndex
+from .engagement import attendance_intervals, concat_intervals, engagement_table
+from .formats import FORMATS, ExportFormat, detect_format, register_format
+from .matcher import ExclusionMatcher
+from .metrics import NULL_METRICS, Metrics
+from .reader import MappedFile, sniff_header
+from .timestamps import REPORT_TZ, export_date, parse_time, session_date
+
+
+DEFAULT_EXCLUDED = 'admin, iblooming, interpreter, host'
+
+
+def report_timestamp():
+    """Current WIB time formatted down to minutes, used to name outputs."""
+    now_utc = datetime.now(timezone.utc)         # current UTC time
+    now = now_utc.astimezone(REPORT_TZ) #WIB
+    return now.strftime("%Y-%m-%d %H:%M")
+
+
+def build_exclusion_pattern(text):
+    """Turn the comma separated exclusion list into a single regex."""
+    excluded_name = [x.strip() for x in text.split(",")]
+    return "|".join(excluded_name)
+
+
+# -----------------------------
+# CLEANERS
+# -----------------------------
+# Header line markers of each export type
+WEBINAR_MARKER = b"User Name (Original Name)"
+MEETING_MARKER = b"Name (original name)"
+
+# Columns that change between a person's reconnects; ignored when
+# deciding whether two attendee rows are the same person
+VOLATILE_COLUMNS = [
+    'User Name (Original Name)','Attended','Join Time','Leave Time',
+    'Time in Session (minutes)','Is Guest','Country/Region Name'
+]
+
+
+ROLES = ["Panelist", "Attendee"]
+
+
+def _constant_category(value, n):
+    if pd.isna(value):
+        return pd.Categorical([value] * n)
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+
+def categorize(frame, **constants):
+    """Store the repeated label columns of ``frame`` as categoricals.
+
+    ``Role`` gets the fixed :data:`ROLES` categories and
+    ``Country/Region Name`` its own values. Keyword arguments add columns
+    holding one value for every row (``Topic``, ``Date``) without building
+    a per-row object array.
+    """
+    for col, value in constants.items():
+        frame[col] = _constant_category(value, len(frame))
+    if "Role" in frame.columns:
+        frame["Role"] = pd.Categorical(frame["Role"], categories=ROLES)
+    if "Country/Region Name" in frame.columns:
+        frame["Country/Region Name"] = frame["Country/Region Name"].astype("category")
+    return frame
+
+
+def concat_frames(frames):
+    """``pd.concat`` that keeps categorical columns categorical.
+
+    Plain concatenation falls back to object dtype when the parts have
+    different categories, so the categories are unified first.
+    """
+    frames = list(frames)
+    categorical = {}
+    for frame in frames:
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                categorical.setdefault(col, {}).update(dict.fromkeys(frame[col].cat.categories))
+    if categorical:
+        aligned = []
+        for frame in frames:
+            changes = {
+                col: frame[col].cat.set_categories(list(categories))
+                for col, categories in categorical.items()
+                if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype)
+            }
+            aligned.append(frame.assign(**changes) if changes else frame)
+        frames = aligned
+    return pd.concat(frames, ignore_index=True)
+
+
+def webinar_metadata(lines):
+    """``(Topic, start)`` from rows 2-3 of a webinar export preamble.
+
+    The brand prefix is stripped from the topic; ``start`` is the parsed
+    ``Actual Start Time`` or ``NaT``.
+    """
+    topic_df = pd.read_csv(io.BytesIO(b"".join(lines[2:4])), dtype=str)
+    start = parse_time(topic_df['Actual Start Time'].iloc[0]) if 'Actual Start Time' in topic_df else pd.NaT
+    try :
+        return topic_df['Topic'].iloc[0].replace('iBlooming: ', ""), start
+    except :
+        return topic_df['Topic'].iloc[0], start
+
+
+def country_long(counts, Date, Topic):
+    """Long ``(Date, Topic, Country, Count)`` rows from a country -> count mapping.
+
+    Countries are dictionary-encoded (categorical); the table is only
+    widened to one column per country by :func:`country_table`.
+    """
+    counts = pd.Series(counts, dtype="int64")
+    return pd.DataFrame({
+        "Date": [Date] * len(counts),
+        "Topic": [Topic] * len(counts),
+        "Country": pd.Categorical(counts.index.astype(str)),
+        "Count": counts.to_numpy(),
+    })
+
+
+def summary_row(Date, Topic, total_attendee, total_panelist, duplicated_data, Type):
+    """One-row summary frame shared by every export type."""
+    return pd.DataFrame([{
+        "Date": Date,
+        "Topic": Topic,
+        "Total_Attendee": total_attendee,
+        "Total_Panelist": total_panelist,
+        "Total_All": total_attendee + total_panelist,
+        "Row_Deleted": duplicated_data,
+        "Type": Type
+    }])
+
+
+def parse_webinar_export(file, metrics=None, engagement=False):
+    """Parse a webinar attendee export in a single pass.
+
+    Returns the summary row, the cleaned frame, the long country counts, the
+    attendee-level email frame, the join/leave intervals and the
+    per-attendee engagement table (see :mod:`~zoom_cleaner.engagement`), so
+    each upload is only read once. The last two are only built with
+    ``engagement`` and are empty otherwise; they cost about as much as the
+    rest of the parse. The header is located by sniffing the start of the
+    file and the table is parsed straight from that offset. Stages are
+    recorded in ``metrics`` if given.
+    """
+    metrics = metrics or NULL_METRICS
+    empty = (pd.DataFrame(),) * 6
+
+    # Find header row from the start of the file only
+    with metrics.stage("header"):
+        sniffed = sniff_header(file, WEBINAR_MARKER)
+        if sniffed is None:
+            return empty
+        Topic, Start = webinar_metadata(sniffed.lines)
+
+    # Read actual table, starting at the header line
+    with metrics.stage("read_csv") as stage:
+        file.seek(sniffed.offset)
+        df_webinar = pd.read_csv(file)
+        stage["rows_out"] = len(df_webinar)
+
+    # Find attendee section
+    attendee_idx = df_webinar[df_webinar['Attended']=="Attendee Details"].index
+    if len(attendee_idx) == 0:
+        return empty
+
+    with metrics.stage("dedup", rows_in=len(df_webinar)) as stage:
+        # Panelists section
+        df_panelist = df_webinar.iloc[2:int(attendee_idx[0])]
+        df_panelist = df_panelist.drop_duplicates(subset=["Email"])
+        df_panelist["Role"] = "Panelist"
+
+        # Attendees section
+        df_attendee = df_webinar.iloc[int(attendee_idx[0])+2:]
+        duplicated_mask = df_attendee.drop(columns=VOLATILE_COLUMNS, errors="ignore").duplicated()
+        df_attendee_clean = df_attendee[~duplicated_mask].copy()
+        df_attendee_clean["Role"] = "Attendee"
+
+        # Merge both
+        df_clean = pd.concat([df_panelist, df_attendee_clean], ignore_index=True)
+
+        # Counts
+        total_panelist = (df_clean["Role"]=="Panelist").sum()
+        total_attendee = (df_clean["Role"]=="Attendee").sum()
+        duplicated_data = df_attendee.duplicated().sum()
+        stage["rows_out"] = len(df_clean)
+
+    if engagement:
+        # Raw join/leave rows, reconnects included
+        with metrics.stage("intervals", rows_in=len(df_webinar)) as stage:
+            df_intervals = concat_intervals([
+                attendance_intervals(df_webinar.iloc[2:int(attendee_idx[0])], "Panelist"),
+                attendance_intervals(df_attendee, "Attendee"),
+            ])
+            stage["rows_out"] = len(df_intervals)
+        joins = df_intervals["Join Time"]
+    else:
+        df_intervals = df_engagement = pd.DataFrame()
+        joins = df_webinar['Join Time'].iloc[2:]
+
+    Date = export_date(Start, joins, df_webinar['Join Time'].iloc[-1])
+    if engagement:
+        df_engagement = webinar_engagement(df_intervals, Topic, Date, metrics)
+
+    # Country tally, long form
+    with metrics.stage("country", rows_in=len(df_clean)) as stage:
+        df_country = df_clean[['Email','Country/Region Name']].dropna()
+        df_t = country_long(df_country['Country/Region Name'].value_counts(sort=False), Date, Topic)
+        stage["rows_out"] = len(df_t)
+
+    categorize(df_clean)
+
+    # Summary
+    new_data = summary_row(Date, Topic, total_attendee, total_panelist, duplicated_data, "Webinar")
+
+    with metrics.stage("email", rows_in=len(df_clean)) as stage:
+        df_email = email_level_from_sections(df_panelist, df_attendee, df_attendee_clean, Topic, Date)
+        stage["rows_out"] = len(df_email)
+
+    return new_data, df_clean, df_t, df_email, df_intervals, df_engagement
+
+
+def webinar_engagement(df_intervals, Topic, Date, metrics=None):
+    """:func:`~zoom_cleaner.engagement.engagement_table` of one webinar, with
+    ``Topic``/``Date`` as categoricals like the other outputs.
+
+    Built at parse time when asked for, so it is cached with the parse
+    result and not redone when only the exclusion list changes.
+    """
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("engagement", rows_in=len(df_intervals)) as stage:
+        df_engagement = engagement_table(df_intervals, Topic, Date)
+        categorize(df_engagement, Topic=Topic, Date=Date)
+        stage["rows_out"] = len(df_engagement)
+    return df_engagement
+
+
+def email_level_from_sections(df_panelist, df_attendee, df_attendee_clean, Topic, Date=None):
+    """Build attendee-level rows (unique per Email–Topic–Date) from the
+    already split and deduplicated webinar sections.
+
+    ``Date`` defaults to the date of the last attendee row.
+    """
+    keep_cols = ["User Name (Original Name)", "Email"]
+    if "Country/Region Name" in df_attendee.columns:
+        keep_cols.append("Country/Region Name")
+
+    # -----------------------------
+    # Panelists
+    # -----------------------------
+    if not df_panelist.empty and "Email" in df_panelist.columns:
+        df_panelist = df_panelist[keep_cols].copy()
+        df_panelist["Role"] = "Panelist"
+    else:
+        df_panelist = pd.DataFrame()
+
+    # -----------------------------
+    # Attendees
+    # -----------------------------
+    if df_attendee.empty:
+        # Panelists only; still tagged with Topic/Date below
+        out = df_panelist
+    else:
+        if Date is None:
+            Date = str(df_attendee['Join Time'].iloc[-1])[:10]
+
+        df_attendee_clean = df_attendee_clean[keep_cols].copy()
+        df_attendee_clean["Role"] = "Attendee"
+
+        # -----------------------------
+        # Merge Both
+        # -----------------------------
+        out = pd.concat([df_panelist, df_attendee_clean], ignore_index=True)
+
+    if out.empty:
+        return pd.DataFrame()
+
+    categorize(out, Topic=Topic, Date=Date)
+
+    # Ensure proper column order
+    col_order = [
+        "User Name (Original Name)", "Email", "Country/Region Name",
+        "Role", "Topic", "Date"
+    ]
+    out = out.reindex(columns=col_order)
+
+    # Drop duplicates across Role/Email/Topic/Date
+    out = out.drop_duplicates(subset=["Email", "Role", "Topic", "Date"], keep="first")
+
+    return out
+
+
+def count_webinar_participant(file):
+    new_data, df_clean, df_t = parse_webinar_export(file)[:3]
+    return new_data, df_clean, df_t
+
+
+MeetingExport = namedtuple("MeetingExport", ["Date", "Topic", "participants", "duplicated_data"])
+MeetingExport.__doc__ = """Parsed meeting export, independent of the exclusion list."""
+
+
+def meeting_metadata(lines):
+    """``(Date, Topic)`` from the metadata rows above a meeting header line."""
+    df_meta = pd.read_csv(io.BytesIO(b"".join(lines[:-1])))
+    Topic = df_meta.iloc[0,0]
+    Date = session_date(parse_time(df_meta['Start time'].iloc[0]))   # as written, assumed WIB
+    return Date, Topic
+
+
+def parse_meeting_export(file, metrics=None):
+    """Read a meeting participants export and deduplicate its participants.
+
+    Returns a :class:`MeetingExport` or ``None`` when no header is found.
+    Role tagging is left to :func:`summarize_meeting` so that changing the
+    exclusion list does not require re-reading the file.
+    """
+    metrics = metrics or NULL_METRICS
+
+    # Find header row from the start of the file only
+    with metrics.stage("header"):
+        sniffed = sniff_header(file, MEETING_MARKER)
+        if sniffed is None:
+            return None
+
+        Date, Topic = meeting_metadata(sniffed.lines)
+
+    # Read dataframe starting from header row
+    with metrics.stage("read_csv") as stage:
+        file.seek(sniffed.offset)
+        df_meeting = pd.read_csv(file)
+        stage["rows_out"] = len(df_meeting)
+
+    # Clean data
+    with metrics.stage("dedup", rows_in=len(df_meeting)) as stage:
+        df_meeting_clean = df_meeting[['Name (original name)','Total duration (minutes)']].drop_duplicates()
+        duplicated_data = df_meeting[['Name (original name)','Total duration (minutes)']].duplicated().sum()
+        stage["rows_out"] = len(df_meeting_clean)
+
+    return MeetingExport(Date, Topic, df_meeting_clean, duplicated_data)
+
+
+def as_matcher(excluded_name):
+    """Accept either an :class:`ExclusionMatcher` or a legacy regex string."""
+    if isinstance(excluded_name, ExclusionMatcher):
+        return excluded_name
+    return ExclusionMatcher([excluded_name], mode="regex")
+
+
+def summarize_meeting(parsed, excluded_name, metrics=None):
+    """Tag Panelist/Attendee roles on a parsed meeting and build its summary.
+
+    ``excluded_name`` is an :class:`ExclusionMatcher` or a regex string.
+    """
+    if parsed is None:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    metrics = metrics or NULL_METRICS
+    Date, Topic = parsed.Date, parsed.Topic
+    df_meeting_clean = parsed.participants.copy()
+
+    # Panelist vs Attendee
+    with metrics.stage("roles", rows_in=len(df_meeting_clean)) as stage:
+        matcher = as_matcher(excluded_name)
+        df_meeting_clean['Role'] = pd.Categorical(
+            matcher.roles(df_meeting_clean['Name (original name)']), categories=ROLES
+        )
+        stage["rows_out"] = len(df_meeting_clean)
+
+    # Counts
+    total_panelist = (df_meeting_clean['Role']=="Panelist").sum()
+    total_attendee = (df_meeting_clean['Role']=="Attendee").sum()
+
+    # No country data in meeting exports
+    df_t = country_long({}, Date, Topic)
+
+    # Summary
+    new_data = summary_row(Date, Topic, total_attendee, total_panelist, parsed.duplicated_data, "Meeting")
+
+    return new_data, df_meeting_clean, df_t
+
+
+def count_meeting_participant(file, excluded_name):
+    return summarize_meeting(parse_meeting_export(file), excluded_name)
+
+
+def clean_email_level(file):
+    """Build attendee-level CSV (unique per Email–Topic–Date) from webinar files,
+    including both Panelists and Attendees.
+    """
+    return parse_webinar_export(file)[3]
+
+
+# -----------------------------
+# BATCH PROCESSING
+# -----------------------------
+ENGINES = ("pandas", "polars")
+
+
+def available_engines():
+    """The :data:`ENGINES` whose dependencies are installed."""
+    return [e for e in ENGINES if e != "polars" or importlib.util.find_spec("polars") is not None]
+
+
+def export_identity(file, kind):
+    """``(kind, Topic, session ID, start time)`` from an export's metadata rows.
+
+    Only the start of the file is read. Two exports with the same identity
+    are the same webinar or meeting. Returns ``None`` when the metadata has
+    no ID or start time, so such files are never merged.
+    """
+    sniffed = sniff_header(file, FORMATS[kind].marker)
+    file.seek(0)
+    if sniffed is None:
+        return None
+    lines = (line.decode("utf-8-sig", "replace") for line in sniffed.lines[:-1])
+    rows = [row for row in csv.reader(lines) if row]
+    for header, values in zip(rows, rows[1:]):
+        meta = dict(zip(header, values))
+        session_id = meta.get("Webinar ID") or meta.get("Meeting ID") or meta.get("ID")
+        start = meta.get("Actual Start Time") or meta.get("Start time") or meta.get("Start Time")
+        if session_id and start:
+            return kind, meta.get("Topic", ""), session_id.replace(" ", ""), start
+    return None
+
+
+def merge_webinar_exports(parts):
+    """Combine parsed exports of one webinar as if they were one file.
+
+    The cleaned rows are deduplicated again across the exports, so people in
+    both are counted once; rows repeated across exports add to ``Row_Deleted``.
+    Join/leave rows in both exports also count once. Streamed exports only
+    keep interval blocks, so when one of them partly overlaps another, the
+    ``Reconnects`` of attendees in the overlap can be over-counted.
+    """
+    parts = [part for part in parts if not part[0].empty]
+    if len(parts) < 2:
+        return parts[0] if parts else (pd.DataFrame(),) * 6
+    Date = max(part[0]["Date"].iloc[0] for part in parts)
+    Topic = parts[0][0]["Topic"].iloc[0]
+
+    clean = concat_frames([part[1] for part in parts])
+    is_panelist = (clean["Role"] == "Panelist").to_numpy()
+    df_panelist = clean[is_panelist].drop_duplicates(subset=["Email"])
+    df_attendee = clean[~is_panelist]
+    duplicated_mask = df_attendee.drop(columns=VOLATILE_COLUMNS, errors="ignore").duplicated()
+    df_attendee_clean = df_attendee[~duplicated_mask]
+    duplicated_data = sum(int(part[0]["Row_Deleted"].iloc[0]) for part in parts) + df_attendee.duplicated().sum()
+
+    df_clean = concat_frames([df_panelist, df_attendee_clean])
+    df_country = df_clean[['Email','Country/Region Name']].dropna()
+    df_t = country_long(df_country['Country/Region Name'].value_counts(sort=False), Date, Topic)
+    new_data = summary_row(Date, Topic, len(df_attendee_clean), len(df_panelist), duplicated_data, "Webinar")
+    df_email = email_level_from_sections(df_panelist, df_attendee, df_attendee_clean, Topic, Date)
+    df_intervals = concat_intervals([part[4] for part in parts])
+    df_engagement = webinar_engagement(df_intervals, Topic, Date) if not df_intervals.empty else pd.DataFrame()
+    return new_data, df_clean, df_t, df_email, df_intervals, df_engagement
+
+
+def merge_meeting_exports(parts):
+    """Combine parsed exports of one meeting, deduplicating participants across them."""
+    parts = [part for part in parts if part is not None]
+    if len(parts) < 2:
+        return parts[0] if parts else None
+    participants = pd.concat([part.participants for part in parts], ignore_index=True)
+    duplicated = participants.duplicated()
+    return MeetingExport(
+        parts[0].Date, parts[0].Topic, participants[~duplicated],
+        sum(part.duplicated_data for part in parts) + duplicated.sum()
+    )
+
+
+def _result_kind(parsed):
+    # Results passed without their format name: meetings are the only
+    # built-in format that is not a webinar-style tuple
+    return "meeting" if isinstance(parsed, MeetingExport) or parsed is None else "webinar"
+
+
+def merge_parsed(parts, kind=None):
+    """Merge :func:`parse_file` results that belong to the same session.
+
+    ``kind`` is the name of their export format, whose ``merge`` hook does
+    the work; without it the format is guessed from the results.
+    """
+    fmt = FORMATS[kind or _result_kind(parts[0])]
+    return (fmt.merge or merge_webinar_exports)(parts)
+
+
+def _parse_webinar(file, streaming, metrics, engine, engagement):
+    if engine == "polars":
+        from .polars_engine import polars_webinar_export
+        return polars_webinar_export(file, metrics, engagement)
+    elif streaming:
+        from .streaming import stream_webinar_export
+        return stream_webinar_export(file, metrics=metrics, engagement=engagement)
+    return parse_webinar_export(file, metrics, engagement)
+
+
+def _parse_meeting(file, streaming, metrics, engine, engagement):
+    if engine == "polars":
+        from .polars_engine import polars_meeting_export
+        return polars_meeting_export(file, metrics)
+    return parse_meeting_export(file, metrics)
+
+
+def _finish_webinar(parsed, excluded_name, metrics=None):
+    # Webinars are already complete; only their intervals are dropped
+    new_data, df_clean, df_t, df_email, _, df_engagement = parsed
+    return new_data, df_clean, df_t, df_email, df_engagement
+
+
+def _finish_meeting(parsed, excluded_name, metrics=None):
+    # Meetings have no join/leave rows, so their engagement frame is empty
+    result, cleaned, df_t = summarize_meeting(parsed, excluded_name, metrics)
+    return result, cleaned, df_t, pd.DataFrame(), pd.DataFrame()
+
+
+register_format(ExportFormat("webinar", WEBINAR_MARKER, _parse_webinar, _finish_webinar, merge_webinar_exports))
+register_format(ExportFormat("meeting", MEETING_MARKER, _parse_meeting, _finish_meeting, merge_meeting_exports))
+
+
+def export_kind(file):
+    """Name of the registered export format of ``file`` (``"webinar"``,
+    ``"meeting"``, ...) or ``None``, detected from its first bytes."""
+    fmt = detect_format(file)
+    return fmt.name if fmt is not None else None
+
+
+def parse_file(file, streaming=False, metrics=None, engine="pandas", kind=None, engagement=False):
+    """Parse one export into its exclusion-independent form.
+
+    The format is detected from the content (see
+    :mod:`~zoom_cleaner.formats`), not the file name. Webinars are fully
+    cleaned here; meetings stop at the deduplicated participant list. With
+    ``streaming`` webinars are read in chunks by
+    :func:`~zoom_cleaner.streaming.stream_webinar_export`. ``engine`` is one
+    of :data:`ENGINES`; ``"polars"`` parses both kinds with the optional
+    Polars backend and ignores ``streaming``. Returns ``None`` for unknown
+    file types. ``kind`` skips detection when the format is already known.
+    ``engagement`` also builds the per-attendee time-in-session table.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, not {engine!r}")
+    fmt = FORMATS[kind] if kind is not None else detect_format(file)
+    if fmt is None:
+        return None
+    return fmt.parse(file, streaming, metrics, engine, engagement)
+
+
+def finish_file(parsed, excluded_name, metrics=None, kind=None):
+    """Turn a :func:`parse_file` result into
+    ``(result, cleaned, df_t, df_email, df_engagement)``.
+
+    Dispatches to the ``finish`` hook of the export format named ``kind``;
+    without it the format is guessed from the result. Meetings are tagged
+    against ``excluded_name`` here, webinars are already complete.
+    """
+    fmt = FORMATS[kind or _result_kind(parsed)]
+    return (fmt.finish or _finish_webinar)(parsed, excluded_name, metrics)
+
+
+def process_file(file, excluded_name, streaming=False, metrics=None, engine="pandas", engagement=False):
+    """Route one export to its cleaner based on its content.
+
+    Returns ``(result, cleaned, df_t, df_email, df_engagement)`` or ``None``
+    for unknown types.
+    """
+    kind = export_kind(file)
+    if kind is None:
+        return None
+    parsed = parse_file(file, streaming, metrics, engine, kind, engagement)
+    return finish_file(parsed, excluded_name, metrics, kind)
+
+
+class ResultCollector:
+    """Collect per-file outputs and build each combined table once.
+
+    Appending to a DataFrame with ``pd.concat`` for every file copies the
+    whole accumulated table each time. Here the partial frames are kept in
+    lists and concatenated at the end; with ``batch_size`` the pending
+    frames are folded into one every ``batch_size`` files, so no row is
+    copied more than twice. Categorical columns stay categorical.
+
+    Email rows go through a batch-wide :class:`EmailIndex`, which drops rows
+    already collected and adds unique / new / returning attendee counts
+    per session to the summary.
+    """
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size
+        self.emails = EmailIndex()
+        self._parts = {"summary": [], "email": [], "country": [], "engagement": []}
+        self._pending = {"summary": [], "email": [], "country": [], "engagement": []}
+
+    def add(self, result, cleaned, df_t, df_email, df_engagement):
+        df_email = self.emails.add(df_email)
+        frames = (("summary", result), ("email", df_email), ("country", df_t), ("engagement", df_engagement))
+        for key, frame in frames:
+            if frame.empty:
+                continue
+            pending = self._pending[key]
+            pending.append(frame)
+            if self.batch_size and len(pending) >= self.batch_size:
+                self._fold(key)
+
+    def _fold(self, key):
+        pending = self._pending[key]
+        if pending:
+            self._parts[key].append(concat_frames(pending))
+            pending.clear()
+
+    def _materialize(self, key):
+        self._fold(key)
+        parts = self._parts[key]
+        if not parts:
+            return pd.DataFrame()
+        if len(parts) > 1:
+            parts[:] = [concat_frames(parts)]
+        return parts[0]
+
+    def materialize(self):
+        """Return ``(data_summary, data_email, data_country, data_engagement)``."""
+        return (
+            self.emails.merge_into(self._materialize("summary")),
+            self._materialize("email"),
+            self._materialize("country"),
+            self._materialize("engagement"),
+        )
+
+
+# Marks a cache miss; a cached parse result can itself be None
+_MISSING = object()
+
+
+def _cache_params(kind, streaming, engine, engagement):
+    # Parsed results do not depend on the exclusion list, so it is not part
+    # of the key: editing the list only re-runs summarize_meeting.
+    return kind, streaming, engine, engagement
+
+
+def parse_cached(file, cache=None, streaming=False, metrics=None, engine="pandas", kind=None, digest=None,
+                 engagement=False):
+    """``parse_file`` memoized in ``cache`` by file content and export kind.
+
+    ``kind`` and ``digest`` (the file's :func:`~zoom_cleaner.cache.file_content_key`)
+    are worked out here unless the caller already has them.
+    """
+    if cache is None:
+        return parse_file(file, streaming, metrics, engine, kind, engagement)
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("cache_lookup") as stage:
+        kind = kind or export_kind(file)
+        key = result_key(digest or file_content_key(file), *_cache_params(kind, streaming, engine, engagement))
+        # One get() rather than a membership test, since a shared cache can
+        # evict the entry in between
+        parsed = cache.get(key, _MISSING)
+        stage["rows_out"] = int(parsed is not _MISSING)
+    if parsed is not _MISSING:
+        return parsed
+    parsed = parse_file(file, streaming, metrics, engine, kind, engagement)
+    cache.put(key, parsed)
+    return parsed
+
+
+def process_cached(file, excluded_name, cache=None, streaming=False, metrics=None, engine="pandas",
+                   engagement=False):
+    """``process_file`` backed by a cache of parsed exports."""
+    kind = export_kind(file)
+    parsed = parse_cached(file, cache, streaming, metrics, engine, kind, engagement=engagement)
+    return finish_file(parsed, excluded_name, metrics, kind)
+
+
+def _parse_job(payload):
+    """Process-pool worker: parse one export passed as
+    ``(filename, source, kind, streaming, engine, engagement, trace_memory)``.
+
+    ``source`` is the path of an on-disk input, which the worker maps
+    itself, or the bytes of an upload. Returns ``(parsed, metric_records)``;
+    records are only collected when ``trace_memory`` is not ``None``.
+    """
+    filename, source, kind, streaming, engine, engagement, trace_memory = payload
+    if isinstance(source, str):
+        file = MappedFile(source)
+    else:
+        file = io.BytesIO(source)
+        file.name = filename
+    try:
+        if trace_memory is None:
+            return parse_file(file, streaming, None, engine, kind, engagement), []
+        metrics = Metrics(trace_memory)
+        metrics.current_file = filename
+        return parse_file(file, streaming, metrics, engine, kind, engagement), metrics.records
+    finally:
+        file.close()
+
+
+def _job_payload(filename, file, kind, streaming, engine, engagement, trace_memory):
+    # Only uploads are copied to the worker; on-disk inputs go by path
+    if isinstance(file, MappedFile):
+        source = file.name
+    else:
+        file.seek(0)
+        source = file.read()
+    return filename, source, kind, streaming, engine, engagement, trace_memory
+
+
+def _unique_files(files, skipped):
+    """Return ``(filename, file, kind, digest, identity)`` for each upload that needs parsing.
+
+    Repeated names, unknown types and files with the same content as an
+    earlier upload are recorded in ``skipped`` instead. Names are compared
+    as given, so on-disk inputs are told apart by their full path
+    (``2025-01/report.csv`` vs ``2025-02/report.csv``). This is the only
+    place files are detected and hashed; their kind and content digest are
+    passed on to the cache lookup and the parser. Metadata rows are sniffed
+    for :func:`export_identity`; nothing is parsed.
+    """
+    processed_files = set()   # prevent duplicates
+    contents = set()
+    unique = []
+    for file in files:
+        filename = os.path.basename(file.name)
+        if file.name in processed_files:
+            skipped.append((filename, "duplicate"))
+            continue
+        processed_files.add(file.name)
+
+        kind = export_kind(file)
+        if kind is None:
+            skipped.append((filename, "unknown"))
+            continue
+
+        digest = file_content_key(file)
+        if digest in contents:
+            skipped.append((filename, "duplicate content"))
+            continue
+        contents.add(digest)
+        unique.append((filename, file, kind, digest, export_identity(file, kind)))
+    return unique
+
+
+def process_files(files, excluded_name, workers=1, batch_size=None, cache=None, streaming=False,
+                  metrics=None, progress=None, engine="pandas", engagement=False):
+    """Clean a batch of exports.
+
+    With ``workers > 1`` each file is cleaned in a separate process; results
+    are always merged in upload order, so the output does not depend on the
+    worker count.
+
+    Returns ``(data_summary, data_email, data_country, data_engagement,
+    skipped)`` where ``skipped`` lists ``(filename, reason)`` pairs for
+    repeated names, repeated content, unknown file types and exports merged
+    into a later one. Exports of the same session (see
+    :func:`export_identity`) are combined with :func:`merge_parsed` instead
+    of being counted twice. ``batch_size`` is passed to
+    :class:`ResultCollector`. When a :class:`~zoom_cleaner.cache.ResultCache`
+    (or a session view of a :class:`~zoom_cleaner.cache.SharedResultCache`)
+    is given, files whose content was seen before are not parsed again; for meetings only the role tagging
+    is redone against ``excluded_name``. ``streaming`` selects the chunked
+    low-memory webinar reader and ``engine`` the parsing backend (see
+    :func:`parse_file`). ``data_engagement`` is only filled with
+    ``engagement``. A :class:`~zoom_cleaner.metrics.Metrics`
+    receives per-file stage records, including those from worker processes.
+    ``progress(filename, result)`` is called with each file's
+    ``(result, cleaned, df_t, df_email, df_engagement)`` as soon as it is
+    collected, and with ``result=None`` for each skipped or merged file, so
+    every input is reported exactly once.
+    """
+    collector = ResultCollector(batch_size)
+    skipped = []
+    trace_memory = metrics.trace_memory if metrics is not None else None
+    metrics = metrics or NULL_METRICS
+
+    unique = _unique_files(files, skipped)
+    if progress is not None:
+        for filename, _ in skipped:
+            progress(filename, None)
+    # Exports of one session are merged when the last of them is parsed
+    sessions = Counter(identity for *_, identity in unique if identity is not None)
+    waiting = {}
+
+    def collect(filename, kind, identity, parsed):
+        if sessions[identity] > 1:
+            parts = waiting.setdefault(identity, [])
+            parts.append(parsed)
+            if len(parts) < sessions[identity]:
+                skipped.append((filename, "merged"))
+                if progress is not None:
+                    progress(filename, None)
+                return
+            parsed = merge_parsed(waiting.pop(identity), kind)
+        metrics.current_file = filename
+        result = finish_file(parsed, excluded_name, metrics, kind)
+        collector.add(*result)
+        if progress is not None:
+            progress(filename, result)
+
+    if workers > 1:
+        parsed = []
+        for filename, file, kind, digest, _ in unique:
+            key = None
+            item = _MISSING
+            if cache is not None:
+                key = result_key(digest, *_cache_params(kind, streaming, engine, engagement))
+                item = cache.get(key, _MISSING)
+            parsed.append((key, item))
+        todo = iter([
+            (filename, file, kind) for (filename, file, kind, *_), (_, item) in zip(unique, parsed)
+            if item is _MISSING
+        ])
+        pool = None
+        if any(item is _MISSING for _, item in parsed):
+            # Polars' thread pool does not survive fork()
+            uses_polars = engine == "polars" or "polars" in sys.modules
+            context = multiprocessing.get_context("spawn") if uses_polars else None
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        # A few files per worker in flight, so uploads are not all copied
+        # into memory (and pickled) up front
+        in_flight = deque()
+
+        def submit_next():
+            job = next(todo, None)
+            if job is not None:
+                in_flight.append(pool.submit(_parse_job, _job_payload(*job, streaming, engine, engagement, trace_memory)))
+
+        try:
+            if pool is not None:
+                for _ in range(2 * workers):
+                    submit_next()
+            # Futures are taken in submission order, so each file is finished
+            # as soon as it and every file before it have been parsed
+            for (filename, _, kind, _, identity), (key, item) in zip(unique, parsed):
+                if item is _MISSING:
+                    item, records = in_flight.popleft().result()
+                    submit_next()
+                    metrics.extend(records)
+                    if cache is not None:
+                        cache.put(key, item)
+                collect(filename, kind, identity, item)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    else:
+        for filename, file, kind, digest, identity in unique:
+            metrics.current_file = filename
+            parsed = parse_cached(file, cache, streaming, metrics, engine, kind, digest, engagement)
+            collect(filename, kind, identity, parsed)
+    metrics.current_file = None
+
+    with metrics.stage("collect", file="(batch)") as stage:
+        data_summary, data_email, data_country, data_engagement = collector.materialize()
+        stage["rows_out"] = len(data_email)
+    return data_summary, data_email, data_country, data_engagement, skipped
+
+
+def country_counts(data_country):
+    """Long country counts summed per (Date, Topic, Country)."""
+    return (
+        data_country.groupby(["Date","Topic","Country"], observed=True, sort=False)["Count"]
+        .sum()
+        .reset_index()
+    )
+
+
+def country_table(data_country):
+    """Widen long country counts to one row per (Date, Topic), one column per country."""
+    if data_country.empty:
+        return pd.DataFrame()
+    wide = country_counts(data_country).pivot_table(
+        index=["Date","Topic"],
+        columns="Country",
+        values="Count",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True
+    )
+    wide.columns = [str(c) for c in wide.columns]
+    return wide.reset_index()
+
+
+def merge_country_counts(data_summary, data_country):
+    """Merge aggregated country counts into the summary table."""
+    if data_summary.empty or data_country.empty:
+        return data_summary
+    wide = country_table(data_country)
+    countries = [c for c in wide.columns if c not in ("Date", "Topic")]
+    merged = pd.merge(
+        data_summary,
+        wide,
+        on=["Date","Topic"],
+        how="left"
+    ).fillna(0)
+    return merged.astype({c: "int64" for c in countries})
+
+
+# -----------------------------
+# OUTPUT
+# -----------------------------
+CSV_CHUNK_ROWS = 50_000
+
+
+def _write_csv(df, stream):
+    # utf-8-sig for Excel safety; rows are encoded and compressed chunk by
+    # chunk, so the whole CSV never exists as one string
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for start in range(0, max(len(df), 1), CSV_CHUNK_ROWS):
+        df.iloc[start:start + CSV_CHUNK_ROWS].to_csv(text, header=start == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(df, stream):
+    df.to_parquet(stream, index=False)
+
+
+def _write_feather(df, stream):
+    df.reset_index(drop=True).to_feather(stream)
+
+
+# format -> (file extension, writer); parquet/feather need pyarrow
+OUTPUT_FORMATS = {
+    "csv": (".csv", _write_csv),
+    "parquet": (".parquet", _write_parquet),
+    "feather": (".feather", _write_feather),
+}
+
+
+def zip_entry(name, compresslevel=6):
+    """``ZipInfo`` for a new entry stamped with the current WIB time.
+
+    ``compresslevel`` 1-9 deflates the entry, 0 stores it. A bare name
+    passed to ``ZipFile.open``/``writestr`` would be dated 1980-01-01.
+    """
+    now = datetime.now(timezone.utc).astimezone(REPORT_TZ)
+    info = zipfile.ZipInfo(name, date_time=now.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED if compresslevel else zipfile.ZIP_STORED
+    info._compresslevel = compresslevel or None
+    return info
+
+
+def build_zip(data_summary, data_email, formatted_datetime, formats=("csv",), data_country=None,
+              compresslevel=6, file=None, data_engagement=None):
+    """Write the result tables into a ZIP.
+
+    One entry per table and format is streamed straight into the archive.
+    CSV keeps the original summary/email pair for Excel users; the columnar
+    formats also include the per-session country table when ``data_country``
+    is given. The per-attendee ``data_engagement`` table, if given, is
+    written in every format. ``compresslevel`` 1-9 deflates the entries, 0
+    stores them.
+    The ZIP is written to ``file`` if given, otherwise to a new ``BytesIO``;
+    the target is returned rewound.
+    """
+    tables = {"data_summary": data_summary, "data_email": data_email}
+    if data_engagement is not None and not data_engagement.empty:
+        tables["data_engagement"] = data_engagement
+    columnar_tables = dict(tables)
+    if data_country is not None and not data_country.empty:
+        columnar_tables["data_country"] = country_table(data_country)
+
+    # Create ZIP
+    zip_buffer = io.BytesIO() if file is None else file
+    with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+        for fmt in formats:
+            extension, writer = OUTPUT_FORMATS[fmt]
+            for name, df in (tables if fmt == "csv" else columnar_tables).items():
+                info = zip_entry(f"{formatted_datetime}_{name}{extension}", compresslevel)
+                with zip_file.open(info, "w", force_zip64=True) as entry:
+                    writer(df, entry)
+    zip_buffer.seek(0)
+    return zip_buffer
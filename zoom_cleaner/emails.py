@@ -0,0 +1,109 @@
+"""Batch-wide index of attendee emails.
+
+Each file's email-level rows are already unique per ``(Email, Role, Topic,
+Date)``, but the batch table is just their concatenation. :class:`EmailIndex`
+keeps 64-bit hashes of normalized emails across every file of a batch, so
+repeated rows are dropped with a set lookup as files arrive, and each session
+gets its unique / new / returning attendee counts without re-sorting or
+deduplicating the combined table. New / returning are decided by session
+date, not by the order files were uploaded in.
+"""
+import numpy as np
+import pandas as pd
+
+
+KEY_COLUMNS = ["Email", "Role", "Topic", "Date"]
+STAT_COLUMNS = ["Unique_Attendee", "New_Attendee", "Returning_Attendee"]
+
+
+def normalize_emails(emails):
+    """Lower-cased, stripped emails; blanks become missing."""
+    emails = pd.Series(emails, dtype=object).str.strip().str.lower()
+    return emails.where(emails != "")
+
+
+class EmailIndex:
+    """Hashed emails and row keys seen so far in one batch.
+
+    Each session keeps the set of its attendees' hashes. An attendee is
+    "new" in the earliest session (by ``Date``) of the batch they appear in
+    and "returning" in every later one. Rows without an email are kept but
+    never counted.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._attendees = set()
+        self._sessions = {}     # (Date, Topic) -> attendee hashes
+
+    def __len__(self):
+        """Unique attendee emails across the batch."""
+        return len(self._attendees)
+
+    def add(self, df_email):
+        """Drop rows already in the batch, count the session and return the rest.
+
+        Frames without the key columns are returned unchanged.
+        """
+        if df_email.empty or not set(KEY_COLUMNS).issubset(df_email.columns):
+            return df_email
+        emails = normalize_emails(df_email["Email"])
+        keys = pd.util.hash_pandas_object(
+            df_email[KEY_COLUMNS[1:]].assign(Email=emails.to_numpy(object)), index=False
+        ).to_numpy()
+
+        keep = np.zeros(len(keys), dtype=bool)
+        seen = self._keys
+        for i, key in enumerate(keys.tolist()):
+            if key not in seen:
+                seen.add(key)
+                keep[i] = True
+        if not keep.all():
+            df_email = df_email[keep]
+            emails = emails[keep]
+
+        attendee = (df_email["Role"] == "Attendee").to_numpy() & emails.notna().to_numpy()
+        if attendee.any():
+            rows = pd.DataFrame({
+                "Date": df_email["Date"].to_numpy()[attendee],
+                "Topic": df_email["Topic"].to_numpy()[attendee],
+                "hash": pd.util.hash_array(emails.to_numpy(object)[attendee]),
+            })
+            for (Date, Topic), group in rows.groupby(["Date", "Topic"], sort=False, observed=True):
+                hashes = group["hash"].tolist()
+                self._sessions.setdefault((str(Date), str(Topic)), set()).update(hashes)
+                self._attendees.update(hashes)
+        return df_email
+
+    def session_table(self):
+        """Per-session ``Unique/New/Returning_Attendee`` counts, in date order."""
+        if not self._sessions:
+            return pd.DataFrame(
+                {"Date": [], "Topic": [], **{c: pd.Series(dtype="int64") for c in STAT_COLUMNS}}
+            )
+        seen = set()
+        rows = []
+        for (Date, Topic), hashes in sorted(self._sessions.items()):
+            new = len(hashes - seen)
+            seen |= hashes
+            rows.append({
+                "Date": Date,
+                "Topic": Topic,
+                "Unique_Attendee": len(hashes),
+                "New_Attendee": new,
+                "Returning_Attendee": len(hashes) - new,
+            })
+        return pd.DataFrame(rows)
+
+    def merge_into(self, data_summary):
+        """Add the per-session counts as columns of the summary table.
+
+        Email rows only come from webinar exports, so only ``Webinar`` rows
+        are filled; a meeting with the same Date and Topic gets zeros.
+        """
+        if data_summary.empty:
+            return data_summary
+        sessions = self.session_table().assign(Type="Webinar")
+        merged = pd.merge(data_summary, sessions, on=["Date", "Topic", "Type"], how="left")
+        merged[STAT_COLUMNS] = merged[STAT_COLUMNS].fillna(0).astype("int64")
+        return merged
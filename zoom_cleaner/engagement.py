@@ -0,0 +1,134 @@
+"""Per-attendee engagement from the raw join/leave rows of a webinar.
+
+Zoom writes one row per connection, so an attendee who reconnects appears
+several times, sometimes with overlapping intervals (two devices). The
+parsers keep those rows as slim *intervals* (who, role, join, leave) and
+:func:`compact_intervals` collapses them to the union *blocks* of each
+attendee, with ``Rows`` counting the distinct connections behind each
+block. Blocks are small (one or two per attendee) and compacting is
+associative, so a chunked reader can fold its intervals in as it goes and
+exports of one session can be merged from their blocks.
+:func:`engagement_table` turns blocks or raw intervals into one row per
+attendee with the minutes actually attended, first join, last leave and
+reconnect count. Everything is sort-based and vectorized.
+"""
+import numpy as np
+import pandas as pd
+
+from .timestamps import parse_times
+
+
+INTERVAL_COLUMNS = ["User Name (Original Name)", "Email", "Role", "Join Time", "Leave Time"]
+BLOCK_COLUMNS = INTERVAL_COLUMNS + ["Rows"]
+ENGAGEMENT_COLUMNS = [
+    "User Name (Original Name)", "Email", "Role", "Topic", "Date",
+    "First_Join", "Last_Leave", "Attended_Minutes", "Reconnects",
+]
+
+
+def attendance_intervals(section, role):
+    """Slim ``(name, email, role, join, leave)`` rows of one webinar section.
+
+    Times are parsed with :func:`~zoom_cleaner.timestamps.parse_times`. Rows
+    without a valid join and leave time (section headers, blanks) are
+    dropped; so are rows where leave is before join.
+    """
+    if section.empty or "Join Time" not in section.columns or "Leave Time" not in section.columns:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    join = parse_times(section["Join Time"].to_numpy())
+    leave = parse_times(section["Leave Time"].to_numpy())
+    valid = (join.notna() & leave.notna() & (leave >= join)).to_numpy()
+    return pd.DataFrame({
+        "User Name (Original Name)": section["User Name (Original Name)"].to_numpy()[valid],
+        "Email": section["Email"].to_numpy()[valid],
+        "Role": role,
+        "Join Time": join.to_numpy()[valid],
+        "Leave Time": leave.to_numpy()[valid],
+    })
+
+
+def concat_intervals(parts):
+    """Concatenate interval or block frames, skipping empty ones."""
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _who(df):
+    # Attendees are identified by email, or by name when the email is missing
+    who = df["Email"].astype(object).where(df["Email"].notna(), df["User Name (Original Name)"])
+    return who.astype(str)
+
+
+def _groups(role, who):
+    """``(starts, ids)`` of the attendee groups of frames sorted by attendee."""
+    starts = (role.ne(role.shift()) | who.ne(who.shift())).to_numpy()
+    return starts, np.cumsum(starts) - 1
+
+
+def compact_intervals(intervals):
+    """Union blocks of each attendee's intervals, with their ``Rows`` counts.
+
+    Accepts raw intervals, blocks, or a mix of both. Identical input rows
+    count once.
+    """
+    if intervals.empty:
+        return pd.DataFrame(columns=BLOCK_COLUMNS)
+    df = intervals.drop_duplicates(ignore_index=True)
+    if "Rows" not in df.columns:
+        df = df.assign(Rows=1)
+    df = df.assign(_who=_who(df), Role=df["Role"].astype(str))
+    df = df.sort_values(["Role", "_who", "Join Time"], kind="stable", ignore_index=True)
+    group, gid = _groups(df["Role"], df["_who"])
+
+    # A row starts a new block unless it joins before every earlier row of
+    # the same attendee has left
+    join = df["Join Time"].to_numpy()
+    leave = df["Leave Time"].to_numpy()
+    covered = pd.Series(leave).groupby(gid).cummax().to_numpy()
+    new_block = np.ones(len(df), dtype=bool)
+    new_block[1:] = group[1:] | (join[1:] > covered[:-1])
+    block = np.cumsum(new_block) - 1
+
+    rows = df["Rows"].fillna(1).to_numpy()
+    return pd.DataFrame({
+        "User Name (Original Name)": df["User Name (Original Name)"].to_numpy()[new_block],
+        "Email": df["Email"].to_numpy()[new_block],
+        "Role": df["Role"].to_numpy()[new_block],
+        "Join Time": join[new_block],
+        "Leave Time": pd.Series(leave).groupby(block).max().to_numpy(),
+        "Rows": np.bincount(block, weights=rows).astype("int64"),
+    })
+
+
+def engagement_table(intervals, Topic, Date):
+    """One row per attendee and role with the union of their intervals.
+
+    ``intervals`` may be raw intervals or blocks from
+    :func:`compact_intervals`. ``Reconnects`` is the number of distinct
+    connections minus one.
+    """
+    blocks = compact_intervals(intervals)
+    if blocks.empty:
+        return pd.DataFrame(columns=ENGAGEMENT_COLUMNS)
+    # Blocks come out sorted by attendee and join time and do not overlap
+    group, gid = _groups(blocks["Role"], _who(blocks))
+    join = blocks["Join Time"].to_numpy()
+    leave = blocks["Leave Time"].to_numpy()
+    minutes = (leave - join) / np.timedelta64(1, "s") / 60
+    n_groups = gid[-1] + 1
+
+    first = np.flatnonzero(group)
+    last = np.append(first[1:], len(blocks)) - 1
+    return pd.DataFrame({
+        "User Name (Original Name)": blocks["User Name (Original Name)"].to_numpy()[first],
+        "Email": blocks["Email"].to_numpy()[first],
+        "Role": blocks["Role"].to_numpy()[first],
+        "Topic": Topic,
+        "Date": Date,
+        "First_Join": join[first],
+        "Last_Leave": leave[last],
+        "Attended_Minutes": np.bincount(gid, weights=minutes, minlength=n_groups).round(2),
+        "Reconnects": np.bincount(gid, weights=blocks["Rows"].to_numpy(), minlength=n_groups).astype("int64") - 1,
+    })
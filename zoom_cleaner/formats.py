@@ -0,0 +1,66 @@
+"""Registry of Zoom export formats, detected from file content.
+
+Each :class:`ExportFormat` has a header ``marker`` that identifies its
+exports and a ``parse`` function. :func:`detect_format` reads only the first
+:data:`SIGNATURE_BYTES` of a file and returns the first registered format
+whose marker occurs there, so renamed files are still recognised and the
+cost per file does not depend on its size.
+
+The built-in webinar and meeting formats are registered by
+:mod:`zoom_cleaner.core`. Other report types (registration, Q&A, polls)
+plug in with :func:`register_format`::
+
+    register_format(ExportFormat("qa", b"Question,Asker Name", parse_qa_export))
+
+``parse(file, streaming, metrics, engine, engagement)`` returns either a
+:class:`~zoom_cleaner.core.MeetingExport` or, like
+:func:`~zoom_cleaner.core.parse_webinar_export`, a
+``(summary, cleaned, df_t, df_email, df_intervals, df_engagement)`` tuple,
+the last two only filled when ``engagement`` is set; everything after
+parsing (role tagging, collection, output) is shared. Formats
+must be registered at import time of a module so that worker processes see
+them too.
+
+Two optional hooks cover the rest of a format's life: ``finish(parsed,
+excluded_name, metrics)`` turns a parse result into the
+``(result, cleaned, df_t, df_email, df_engagement)`` row of
+:func:`~zoom_cleaner.core.finish_file`, and ``merge(parts)`` combines parse
+results of one session (see :func:`~zoom_cleaner.core.merge_parsed`).
+Left as ``None`` they handle the webinar-style tuple above.
+"""
+from collections import namedtuple
+
+
+SIGNATURE_BYTES = 8 * 1024
+
+ExportFormat = namedtuple(
+    "ExportFormat", ["name", "marker", "parse", "finish", "merge"], defaults=(None, None)
+)
+ExportFormat.__doc__ = """An export type: its name, header line marker, parser and
+optional finish/merge hooks."""
+
+FORMATS = {}
+
+
+def register_format(fmt):
+    """Add ``fmt`` to the registry, replacing a format of the same name.
+
+    Formats are tried in registration order, so a format whose marker is
+    contained in another's must be registered after it.
+    """
+    FORMATS[fmt.name] = fmt
+    return fmt
+
+
+def detect_format(file):
+    """The :class:`ExportFormat` of ``file`` from its first bytes, or ``None``.
+
+    The file is left at position 0.
+    """
+    file.seek(0)
+    prefix = file.read(SIGNATURE_BYTES)
+    file.seek(0)
+    for fmt in FORMATS.values():
+        if fmt.marker in prefix:
+            return fmt
+    return None
@@ -0,0 +1,104 @@
+"""Run a batch in a background thread so a UI can poll its progress."""
+import threading
+import time
+
+import pandas as pd
+
+from .core import concat_frames, merge_country_counts, process_files
+from .metrics import NULL_METRICS
+
+
+class JobCancelled(Exception):
+    """Raised inside the worker thread to stop a cancelled job between files."""
+
+
+class BatchJob:
+    """:func:`~zoom_cleaner.core.process_files` in a daemon thread.
+
+    ``done``, ``rows`` and :meth:`partial_summary` update as files finish.
+    Once :attr:`finished`, ``result`` holds ``(data_summary, data_email,
+    data_country, data_engagement, skipped)`` with the country counts already merged into the
+    summary, or ``error`` the exception that stopped the batch. ``key`` is
+    free for the caller, e.g. to tell whether the inputs have changed.
+    """
+
+    def __init__(self, files, excluded_name, key=None, **options):
+        self.key = key
+        self.metrics = options.get("metrics")
+        # Every input is reported once, skipped and merged files included,
+        # so the files are not read here; that happens in the worker thread
+        self.total = len(files)
+        self.done = 0
+        self.rows = 0
+        self.current = None
+        self.result = None
+        self.error = None
+        self._summaries = []
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._started = None
+        self._ended = None
+        self._thread = threading.Thread(
+            target=self._run, args=(list(files), excluded_name), kwargs=options, daemon=True
+        )
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop after the file currently being processed."""
+        self._cancelled.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def finished(self):
+        return self._ended is not None
+
+    @property
+    def elapsed(self):
+        if self._started is None:
+            return 0.0
+        return (self._ended or time.perf_counter()) - self._started
+
+    @property
+    def throughput(self):
+        """Cleaned rows per second so far."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def partial_summary(self):
+        """Summary rows of the files finished so far."""
+        with self._lock:
+            frames = list(self._summaries)
+        return concat_frames(frames) if frames else pd.DataFrame()
+
+    def _progress(self, filename, result):
+        if self._cancelled.is_set():
+            raise JobCancelled(filename)
+        with self._lock:
+            self.done += 1
+            self.current = filename
+            if result is None:     # skipped or merged into a later file
+                return
+            summary, cleaned = result[0], result[1]
+            self.rows += len(cleaned)
+            if not summary.empty:
+                self._summaries.append(summary)
+
+    def _run(self, files, excluded_name, **options):
+        try:
+            data_summary, data_email, data_country, data_engagement, skipped = process_files(
+                files, excluded_name, progress=self._progress, **options
+            )
+            with (self.metrics or NULL_METRICS).stage("merge", file="(batch)"):
+                data_summary = merge_country_counts(data_summary, data_country)
+            self.result = data_summary, data_email, data_country, data_engagement, skipped
+        except JobCancelled:
+            pass
+        except Exception as exc:  # surfaced to the UI through ``error``
+            self.error = exc
+        finally:
+            self._ended = time.perf_counter()
@@ -0,0 +1,95 @@
+"""Panelist detection for meeting exports.
+
+An :class:`ExclusionMatcher` is built once per exclusion list and applied to
+the whole ``Name (original name)`` column. Only distinct names are matched,
+then the result is broadcast back to the rows.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:  # optional, speeds up long keyword lists
+    ahocorasick = None
+
+
+MODES = ("keyword", "regex")
+
+# Below this many keywords a single compiled alternation is just as fast
+AUTOMATON_MIN_KEYWORDS = 50
+
+
+class ExclusionMatcher:
+    """Case-insensitive "name contains any of these" test.
+
+    In ``"keyword"`` mode the entries are plain text; in ``"regex"`` mode each
+    entry is a regular expression. Empty entries are ignored, so a stray
+    comma no longer turns the list into a match-everything pattern.
+    """
+
+    def __init__(self, keywords, mode="keyword"):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        self.keywords = tuple(k for k in (str(k).strip() for k in keywords) if k)
+        self._regex = None
+        self._automaton = None
+
+        if not self.keywords:
+            return
+        if mode == "keyword" and ahocorasick is not None and len(self.keywords) >= AUTOMATON_MIN_KEYWORDS:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword.casefold(), keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+        elif mode == "keyword":
+            # Longest first so the alternation never stops at a shorter prefix
+            literals = sorted(set(k.casefold() for k in self.keywords), key=len, reverse=True)
+            self._regex = re.compile("|".join(map(re.escape, literals)))
+        else:
+            self._regex = re.compile("|".join(self.keywords), flags=re.IGNORECASE)
+
+    @classmethod
+    def from_text(cls, text, mode="keyword"):
+        """Build a matcher from the comma separated sidebar/CLI text."""
+        return cls(text.split(","), mode=mode)
+
+    @property
+    def key(self):
+        """Hashable identity of the matcher, for caching."""
+        return self.mode, self.keywords
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def __eq__(self, other):
+        return isinstance(other, ExclusionMatcher) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"ExclusionMatcher({list(self.keywords)!r}, mode={self.mode!r})"
+
+    def _match_one(self, name):
+        if self._automaton is not None:
+            return next(self._automaton.iter(name), None) is not None
+        return self._regex.search(name) is not None
+
+    def match(self, names):
+        """Boolean array, True where a name matches any entry."""
+        if not self.keywords:
+            return np.zeros(len(names), dtype=bool)
+        names = pd.Series(names).astype(str)
+        if self.mode == "keyword":
+            names = names.str.casefold()
+        codes, uniques = pd.factorize(names)
+        hits = np.fromiter((self._match_one(name) for name in uniques), dtype=bool, count=len(uniques))
+        return hits[codes]
+
+    def roles(self, names):
+        """"Panelist"/"Attendee" label per name."""
+        return np.where(self.match(names), "Panelist", "Attendee")
@@ -0,0 +1,111 @@
+"""Optional per-file, per-stage instrumentation.
+
+Pass a :class:`Metrics` to the parsers or to ``process_files`` to record, for
+every stage of every file, the wall time, rows in/out and (optionally) the
+peak memory allocated during the stage. Without one, :data:`NULL_METRICS`
+makes every ``stage()`` a no-op.
+"""
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+COLUMNS = ["file", "stage", "seconds", "rows_in", "rows_out", "peak_mb"]
+
+# tracemalloc is process-wide: a stage in one thread starting, resetting or
+# stopping it would clobber the peak of a stage running in another
+_TRACE_LOCK = threading.RLock()
+
+
+class Metrics:
+    """Collects one record per (file, stage).
+
+    Stages must not be nested. With ``trace_memory`` the peak is measured
+    with ``tracemalloc``, which slows parsing down noticeably. Traced stages
+    of every ``Metrics`` in the process run one at a time, so concurrent
+    batch jobs wait for each other while tracing; allocations made by other,
+    untraced threads in the meantime still count towards the peak.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.current_file = None
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows_in=None, file=None):
+        """Time the enclosed block; set ``record["rows_out"]`` inside it."""
+        record = {
+            "file": self.current_file if file is None else file,
+            "stage": name,
+            "rows_in": rows_in,
+            "rows_out": None,
+        }
+        started = False
+        if self.trace_memory:
+            _TRACE_LOCK.acquire()
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            else:
+                tracemalloc.start()
+                started, base = True, 0
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["peak_mb"] = None
+            if self.trace_memory:
+                record["peak_mb"] = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+                if started:
+                    tracemalloc.stop()
+                _TRACE_LOCK.release()
+            self.records.append(record)
+
+    def extend(self, records):
+        self.records.extend(records)
+
+    def to_frame(self):
+        return pd.DataFrame(self.records, columns=COLUMNS)
+
+    def stage_totals(self):
+        """Total time, rows and worst peak per stage, slowest first."""
+        df = self.to_frame()
+        if df.empty:
+            return df
+        return (
+            df.groupby("stage", sort=False)
+            .agg(seconds=("seconds", "sum"), rows_in=("rows_in", "sum"),
+                 rows_out=("rows_out", "sum"), peak_mb=("peak_mb", "max"), files=("file", "nunique"))
+            .sort_values("seconds", ascending=False)
+            .reset_index()
+        )
+
+    def to_json(self):
+        """``metrics.json`` content: every record plus per-stage totals."""
+        def plain(value):
+            return value.item() if hasattr(value, "item") else value
+
+        records = [{k: plain(v) for k, v in r.items()} for r in self.records]
+        totals = self.stage_totals().astype(object)
+        totals = totals.where(totals.notna(), None).to_dict(orient="records")
+        return json.dumps({"records": records, "stage_totals": totals}, indent=2, default=str)
+
+
+class _NullMetrics:
+    current_file = None
+
+    @contextmanager
+    def stage(self, name, rows_in=None, file=None):
+        yield {}
+
+    def extend(self, records):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
@@ -0,0 +1,212 @@
+"""Polars parsing backend (``engine="polars"``).
+
+Same inputs and outputs as :func:`~zoom_cleaner.core.parse_webinar_export`
+and :func:`~zoom_cleaner.core.parse_meeting_export`: pandas frames in the
+same layout, so everything after parsing is shared. Reading, section
+splitting, deduplication and the country tally run as one lazy Polars plan,
+which uses every core instead of pandas' single thread.
+
+Webinar tables are read as text like the streaming reader, and with
+pandas' default missing-value markers so both engines see the same nulls.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:  # optional, multithreaded parsing
+    pl = None
+
+from .core import (
+    MEETING_MARKER,
+    VOLATILE_COLUMNS,
+    WEBINAR_MARKER,
+    MeetingExport,
+    categorize,
+    country_long,
+    meeting_metadata,
+    summary_row,
+    webinar_engagement,
+    webinar_metadata,
+)
+from .engagement import attendance_intervals, concat_intervals
+from .metrics import NULL_METRICS
+from .reader import sniff_header
+from .timestamps import export_date
+
+
+# pandas.read_csv's default na_values
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+INTERVAL_SOURCE_COLUMNS = ["User Name (Original Name)", "Email", "Join Time", "Leave Time"]
+EMAIL_COLUMNS = [
+    "User Name (Original Name)", "Email", "Country/Region Name",
+    "Role", "Topic", "Date"
+]
+
+
+def _require_polars():
+    if pl is None:
+        raise ImportError("engine='polars' needs the optional 'polars' package")
+
+
+def _read_table(file, offset, infer_schema=False):
+    """Read the table starting at ``offset``, dropping blank lines like pandas."""
+    file.seek(offset)
+    df = pl.read_csv(
+        file.read(),
+        infer_schema=infer_schema,
+        infer_schema_length=None,
+        null_values=NA_VALUES,
+        truncate_ragged_lines=True,
+    )
+    return df.filter(~pl.all_horizontal(pl.all().is_null()))
+
+
+def _to_pandas(df):
+    """``df.to_pandas()`` with missing text as NaN, as pandas reads it.
+
+    Polars hands string nulls over as ``None``.
+    """
+    frame = df.to_pandas()
+    text = frame.columns[frame.dtypes == object]
+    if len(text):
+        frame[text] = frame[text].where(frame[text].notna(), np.nan)
+    return frame
+
+
+def _email_level(panelist, attendee_clean, columns, attendee_empty):
+    """Lazy version of :func:`~zoom_cleaner.core.email_level_from_sections`."""
+    keep_cols = ["User Name (Original Name)", "Email"]
+    if "Country/Region Name" in columns:
+        keep_cols.append("Country/Region Name")
+
+    parts = []
+    if "Email" in columns:
+        parts.append(panelist.select(keep_cols).with_columns(Role=pl.lit("Panelist")))
+    if attendee_empty:
+        return parts[0] if parts else None
+    parts.append(attendee_clean.select(keep_cols).with_columns(Role=pl.lit("Attendee")))
+    return pl.concat(parts).unique(subset=["Email", "Role"], keep="first", maintain_order=True)
+
+
+def polars_webinar_export(file, metrics=None, engagement=False):
+    """Polars counterpart of :func:`~zoom_cleaner.core.parse_webinar_export`."""
+    _require_polars()
+    metrics = metrics or NULL_METRICS
+    empty = (pd.DataFrame(),) * 6
+
+    with metrics.stage("header"):
+        sniffed = sniff_header(file, WEBINAR_MARKER)
+        if sniffed is None:
+            return empty
+        Topic, Start = webinar_metadata(sniffed.lines)
+
+    with metrics.stage("read_csv") as stage:
+        df_webinar = _read_table(file, sniffed.offset)
+        stage["rows_out"] = df_webinar.height
+
+    # Find attendee section
+    attendee_idx = df_webinar["Attended"].eq("Attendee Details").arg_true()
+    if len(attendee_idx) == 0:
+        return empty
+    attendee_idx = int(attendee_idx[0])
+
+    with metrics.stage("dedup", rows_in=df_webinar.height) as stage:
+        lf = df_webinar.lazy()
+        panelist = (
+            lf.slice(2, max(attendee_idx - 2, 0))
+            .unique(subset=["Email"], keep="first", maintain_order=True)
+        )
+        attendee = lf.slice(attendee_idx + 2)
+        key_cols = [c for c in df_webinar.columns if c not in VOLATILE_COLUMNS]
+        attendee_clean = attendee.unique(subset=key_cols, keep="first", maintain_order=True)
+        duplicated = attendee.select(pl.len()).join(attendee.unique().select(n_unique=pl.len()), how="cross")
+        clean = pl.concat([
+            panelist.with_columns(Role=pl.lit("Panelist")),
+            attendee_clean.with_columns(Role=pl.lit("Attendee")),
+        ])
+        countries = (
+            clean.drop_nulls(["Email", "Country/Region Name"])
+            .group_by("Country/Region Name", maintain_order=True)
+            .len()
+        )
+        attendee_empty = df_webinar.height <= attendee_idx + 2
+        email = _email_level(panelist, attendee_clean, df_webinar.columns, attendee_empty)
+        plans = [clean, duplicated, countries]
+        if engagement:
+            slim = [c for c in INTERVAL_SOURCE_COLUMNS if c in df_webinar.columns]
+            plans += [lf.slice(2, max(attendee_idx - 2, 0)).select(slim), attendee.select(slim)]
+        plans += [email] if email is not None else []
+        clean, duplicated, countries, *rest = pl.collect_all(plans)
+        sections, email = (rest[:2], rest[2:]) if engagement else ([], rest)
+        stage["rows_out"] = clean.height
+
+    if engagement:
+        with metrics.stage("intervals", rows_in=df_webinar.height) as stage:
+            df_intervals = concat_intervals([
+                attendance_intervals(_to_pandas(sections[0]), "Panelist"),
+                attendance_intervals(_to_pandas(sections[1]), "Attendee"),
+            ])
+            stage["rows_out"] = len(df_intervals)
+        joins = df_intervals["Join Time"]
+    else:
+        df_intervals = df_engagement = pd.DataFrame()
+        joins = df_webinar["Join Time"].slice(2).to_numpy()
+
+    Date = export_date(Start, joins, df_webinar["Join Time"][-1])
+    if engagement:
+        df_engagement = webinar_engagement(df_intervals, Topic, Date, metrics)
+
+    df_clean = categorize(_to_pandas(clean))
+    total_panelist = int((clean["Role"] == "Panelist").sum())
+    total_attendee = clean.height - total_panelist
+    duplicated_data = duplicated["len"][0] - duplicated["n_unique"][0]
+
+    with metrics.stage("country", rows_in=clean.height) as stage:
+        df_t = country_long(
+            dict(zip(countries["Country/Region Name"].to_list(), countries["len"].to_list())), Date, Topic
+        )
+        stage["rows_out"] = len(df_t)
+
+    new_data = summary_row(Date, Topic, total_attendee, total_panelist, duplicated_data, "Webinar")
+
+    with metrics.stage("email", rows_in=clean.height) as stage:
+        if not email or email[0].is_empty():
+            df_email = pd.DataFrame()
+        else:
+            df_email = categorize(_to_pandas(email[0]), Topic=Topic, Date=Date).reindex(columns=EMAIL_COLUMNS)
+        stage["rows_out"] = len(df_email)
+
+    return new_data, df_clean, df_t, df_email, df_intervals, df_engagement
+
+
+def polars_meeting_export(file, metrics=None):
+    """Polars counterpart of :func:`~zoom_cleaner.core.parse_meeting_export`."""
+    _require_polars()
+    metrics = metrics or NULL_METRICS
+
+    with metrics.stage("header"):
+        sniffed = sniff_header(file, MEETING_MARKER)
+        if sniffed is None:
+            return None
+        Date, Topic = meeting_metadata(sniffed.lines)
+
+    with metrics.stage("read_csv") as stage:
+        df_meeting = _read_table(file, sniffed.offset, infer_schema=True)
+        stage["rows_out"] = df_meeting.height
+
+    with metrics.stage("dedup", rows_in=df_meeting.height) as stage:
+        participants = (
+            df_meeting.lazy()
+            .select("Name (original name)", "Total duration (minutes)")
+            .unique(keep="first", maintain_order=True)
+            .collect()
+        )
+        duplicated_data = df_meeting.height - participants.height
+        stage["rows_out"] = participants.height
+
+    return MeetingExport(Date, Topic, _to_pandas(participants), duplicated_data)
@@ -0,0 +1,95 @@
+"""Low-level access to export files.
+
+:func:`sniff_header` finds the table header by reading only the start of a
+file, so the parsers can hand ``read_csv`` a file positioned at the header
+instead of materialising every line first. :class:`MappedFile` gives batch
+jobs a memory-mapped view of an on-disk export with the same file API.
+"""
+import mmap
+from collections import namedtuple
+
+
+SNIFF_BYTES = 64 * 1024
+MAX_SNIFF_BYTES = 1024 * 1024
+
+Sniffed = namedtuple("Sniffed", ["offset", "lines"])
+Sniffed.__doc__ = """Byte offset of the header line, and the lines up to and including it."""
+
+
+def sniff_header(file, marker, block_size=SNIFF_BYTES, limit=MAX_SNIFF_BYTES):
+    """Locate the first line containing ``marker`` near the top of ``file``.
+
+    Reads ``block_size`` bytes at a time and gives up after ``limit`` bytes,
+    since Zoom always puts the header within the first few rows. Returns a
+    :class:`Sniffed` or ``None``; the file position is left undefined.
+    """
+    file.seek(0)
+    prefix = b""
+    while len(prefix) < limit:
+        block = file.read(block_size)
+        if not block:
+            break
+        prefix += block
+        pos = prefix.find(marker)
+        if pos == -1:
+            continue
+        start = prefix.rfind(b"\n", 0, pos) + 1
+        end = prefix.find(b"\n", pos)
+        if end == -1 and len(block) == block_size:
+            # Header line continues past this block
+            continue
+        end = len(prefix) if end == -1 else end + 1
+        return Sniffed(start, prefix[:end].splitlines(keepends=True))
+    return None
+
+
+class MappedFile:
+    """Read-only memory-mapped file for on-disk inputs.
+
+    Supports the subset of the binary file API the parsers and ``read_csv``
+    use. The file descriptor is closed once the file is mapped, so many
+    files can be open at once. Empty files cannot be mapped and fall back to
+    normal reads.
+    """
+
+    def __init__(self, path):
+        self.name = path
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._data = self._file
+        else:
+            self._file.close()
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+    def readline(self, size=-1):
+        return self._data.readline(size)
+
+    def seek(self, offset, whence=0):
+        return self._data.seek(offset, whence)
+
+    def tell(self):
+        return self._data.tell()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+    def close(self):
+        if self._data is not self._file:
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,175 @@
+"""Optional local SQLite store of cleaned results.
+
+Summary rows are upserted on ``(Date, Topic, Type)``, email-level rows on
+``(Email, Role, Topic, Date)`` and country counts on ``(Date, Topic,
+Country)``. Re-ingesting an export therefore replaces its rows instead of
+duplicating them. Ingested files are remembered by content hash so a batch
+job only has to parse new exports.
+"""
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .core import country_counts, merge_country_counts
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary (
+    date TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    type TEXT NOT NULL,
+    total_attendee INTEGER,
+    total_panelist INTEGER,
+    total_all INTEGER,
+    row_deleted INTEGER,
+    PRIMARY KEY (date, topic, type)
+);
+CREATE TABLE IF NOT EXISTS email (
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    date TEXT NOT NULL,
+    user_name TEXT,
+    country TEXT,
+    PRIMARY KEY (email, role, topic, date)
+);
+CREATE TABLE IF NOT EXISTS country (
+    date TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    country TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (date, topic, country)
+);
+CREATE TABLE IF NOT EXISTS ingested_file (
+    content_key TEXT PRIMARY KEY,
+    filename TEXT,
+    ingested_at TEXT
+);
+CREATE INDEX IF NOT EXISTS email_date ON email (date);
+CREATE INDEX IF NOT EXISTS email_email ON email (email);
+"""
+
+# live column name -> database column, in the live column order
+SUMMARY_COLUMNS = {
+    "Date": "date", "Topic": "topic",
+    "Total_Attendee": "total_attendee", "Total_Panelist": "total_panelist",
+    "Total_All": "total_all", "Row_Deleted": "row_deleted", "Type": "type",
+}
+EMAIL_COLUMNS = {
+    "User Name (Original Name)": "user_name", "Email": "email",
+    "Country/Region Name": "country", "Role": "role", "Topic": "topic", "Date": "date",
+}
+
+
+def _records(df, columns):
+    """Rows of ``df`` as tuples of plain Python values, NaN as None."""
+    df = df.reindex(columns=columns).astype(object)
+    return list(df.where(df.notna(), None).itertuples(index=False, name=None))
+
+
+def _upsert_sql(table, columns, key):
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in key) or None
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT ({', '.join(key)}) DO "
+    )
+    return sql + (f"UPDATE SET {updates}" if updates else "NOTHING")
+
+
+class AttendanceStore:
+    """Embedded SQLite database of summary, email-level and country rows."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------
+    # Ingestion
+    # -----------------------------
+    def has_file(self, key):
+        row = self.conn.execute(
+            "SELECT 1 FROM ingested_file WHERE content_key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def mark_files(self, files):
+        """Remember ``(content_key, filename)`` pairs as ingested."""
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ingested_file VALUES (?, ?, ?)",
+                [(key, filename, now) for key, filename in files],
+            )
+
+    def upsert(self, data_summary, data_email, data_country=None):
+        """Insert or replace the rows of one batch."""
+        with self.conn:
+            if not data_summary.empty:
+                columns = list(SUMMARY_COLUMNS.values())
+                rows = _records(data_summary.rename(columns=SUMMARY_COLUMNS), columns)
+                self.conn.executemany(_upsert_sql("summary", columns, ("date", "topic", "type")), rows)
+
+            if not data_email.empty:
+                columns = list(EMAIL_COLUMNS.values())
+                df = data_email.rename(columns=EMAIL_COLUMNS).reindex(columns=columns).astype(object)
+                # Missing emails are stored as '' so they still collapse on the key
+                df["email"] = df["email"].where(df["email"].notna(), "")
+                rows = _records(df, columns)
+                self.conn.executemany(_upsert_sql("email", columns, ("email", "role", "topic", "date")), rows)
+
+            if data_country is not None and not data_country.empty:
+                long = country_counts(data_country).rename(columns=str.lower)
+                columns = ["date", "topic", "country", "count"]
+                rows = _records(long, columns)
+                self.conn.executemany(_upsert_sql("country", columns, ("date", "topic", "country")), rows)
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _where(self, start, end, topic):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(str(end))
+        if topic is not None:
+            clauses.append("topic = ?")
+            params.append(topic)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def summary(self, start=None, end=None, topic=None):
+        """Stored summary rows, with country counts as columns like the live summary."""
+        where, params = self._where(start, end, topic)
+        summary = pd.read_sql_query(
+            f"SELECT {', '.join(SUMMARY_COLUMNS.values())} FROM summary{where} ORDER BY date, topic",
+            self.conn, params=params
+        ).rename(columns={v: k for k, v in SUMMARY_COLUMNS.items()})
+        countries = pd.read_sql_query(
+            f"SELECT * FROM country{where}", self.conn, params=params
+        )
+        countries.columns = ["Date", "Topic", "Country", "Count"]
+        return merge_country_counts(summary, countries)
+
+    def email(self, start=None, end=None, topic=None):
+        """Stored email-level rows in the live column layout."""
+        where, params = self._where(start, end, topic)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(EMAIL_COLUMNS.values())} FROM email{where} ORDER BY date, topic",
+            self.conn, params=params
+        )
+        df["email"] = df["email"].replace("", None)
+        return df.rename(columns={v: k for k, v in EMAIL_COLUMNS.items()}).reindex(columns=list(EMAIL_COLUMNS))
@@ -0,0 +1,235 @@
+"""Bounded-memory reader for very large webinar attendee exports.
+
+:func:`stream_webinar_export` produces the same outputs as
+:func:`~zoom_cleaner.core.parse_webinar_export` but never holds the raw file
+or the full attendee table in memory. The table is read in chunks, the
+"Attendee Details" boundary is found on the fly, and duplicates are tracked
+with sorted arrays of 64-bit row hashes (:class:`SeenHashes`, 8 bytes per
+row) instead of full rows. Only the rows that survive deduplication are
+kept. With ``engagement``, join/leave intervals are folded into each
+attendee's union blocks (see
+:func:`~zoom_cleaner.engagement.compact_intervals`) once the pending ones
+outnumber the blocks, so they need memory per attendee plus a hash per raw
+interval rather than a row per interval. The trade-off: blocks no longer say which
+connections they came from, so merging a streamed export with a partly
+overlapping export of the same session may over-count ``Reconnects``.
+
+All columns are read as text so every chunk hashes the same way.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .core import (
+    VOLATILE_COLUMNS,
+    WEBINAR_MARKER,
+    categorize,
+    country_long,
+    email_level_from_sections,
+    summary_row,
+    webinar_engagement,
+    webinar_metadata,
+)
+from .engagement import attendance_intervals, compact_intervals, concat_intervals
+from .metrics import NULL_METRICS
+from .reader import sniff_header
+from .timestamps import export_date, parse_times
+
+
+DEFAULT_CHUNKSIZE = 50_000
+# Pending intervals are only folded into the blocks once there are at least
+# this many and twice as many as there are blocks, so each interval is
+# re-sorted a bounded number of times however small the chunks are
+MIN_FOLD_ROWS = 100_000
+
+
+def _row_hashes(frame):
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class SeenHashes:
+    """64-bit row hashes seen so far, 8 bytes each.
+
+    Kept as sorted ``uint64`` runs that are merged like a binary counter, so
+    there are at most log2(n) runs and every lookup and insert is a few
+    vectorized ``searchsorted``/``unique`` calls per chunk, with no Python
+    objects per row.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(map(len, self._runs))
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+    def first_seen(self, hashes):
+        """Mask of ``hashes`` not seen before (repeats within ``hashes``
+        count from their first occurrence); the new ones are remembered."""
+        unique, first = np.unique(hashes, return_index=True)
+        new = np.ones(len(unique), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, unique), len(run) - 1)
+            new &= run[pos] != unique
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first[new]] = True
+
+        run = unique[new]
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]))
+        if len(run):
+            self._runs.append(run)
+        return keep
+
+
+def _tally_countries(counter, frame):
+    if "Country/Region Name" not in frame.columns:
+        return
+    counted = frame[['Email','Country/Region Name']].dropna()
+    counter.update(counted['Country/Region Name'].value_counts().to_dict())
+
+
+def _fold_intervals(blocks, pending):
+    """Compact the pending intervals into the union blocks."""
+    return compact_intervals(concat_intervals([blocks, *pending]))
+
+
+def _with_role(parts, columns, role):
+    frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+    frame["Role"] = role
+    return frame
+
+
+def stream_webinar_export(file, chunksize=DEFAULT_CHUNKSIZE, metrics=None, engagement=False):
+    """Chunked equivalent of ``parse_webinar_export`` for huge exports.
+
+    Returns ``(new_data, df_clean, df_t, df_email, df_blocks, df_engagement)``,
+    with interval blocks in place of the raw intervals; those two are only
+    built with ``engagement``. Reading and
+    deduplication are interleaved, so they are recorded as one ``stream``
+    stage in ``metrics``.
+    """
+    metrics = metrics or NULL_METRICS
+    empty = (pd.DataFrame(),) * 6
+
+    # Find header row from the start of the file only
+    with metrics.stage("header"):
+        sniffed = sniff_header(file, WEBINAR_MARKER)
+        if sniffed is None:
+            return empty
+        Topic, Start = webinar_metadata(sniffed.lines)
+
+    with metrics.stage("stream") as stage:
+        file.seek(sniffed.offset)
+        reader = pd.read_csv(file, chunksize=chunksize, dtype=str)
+
+        columns = None
+        boundary = None          # row position of "Attendee Details"
+        start = 0
+        last_row = None
+        last_attendee = None
+
+        panelists = []
+        panelist_seen = SeenHashes()
+        attendees = []
+        attendee_seen = SeenHashes()    # hashes of non-volatile columns
+        row_seen = SeenHashes()         # hashes of full attendee rows
+        duplicated_data = 0
+        countries = Counter()
+        blocks = compact_intervals(concat_intervals([]))
+        interval_seen = SeenHashes()    # hashes of slim interval rows
+        pending = []                    # new intervals not folded in yet
+        n_pending = 0
+        first_joins = []         # earliest join per chunk, for the Date fallback
+
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            if columns is None:
+                columns = chunk.columns
+            if chunk.empty:
+                continue
+            last_row = chunk.iloc[-1:]
+            position = chunk.index.to_numpy()
+
+            if boundary is None:
+                hit = position[(chunk['Attended'] == "Attendee Details").to_numpy()]
+                if len(hit):
+                    boundary = int(hit[0])
+
+            # Panelists section: rows 2 .. boundary-1
+            in_panel = position >= 2
+            if boundary is not None:
+                in_panel &= position < boundary
+            panel = chunk[in_panel]
+            new_intervals = []
+            if not engagement and pd.isna(Start):
+                first_joins.append(parse_times(chunk['Join Time'][position >= 2]).min())
+            if not panel.empty:
+                if engagement:
+                    new_intervals.append(attendance_intervals(panel, "Panelist"))
+                keep = panelist_seen.first_seen(_row_hashes(panel[['Email']]))
+                panel = panel[keep]
+                panelists.append(panel)
+                _tally_countries(countries, panel)
+
+            # Attendees section: rows after "Attendee Details" and its header
+            attendee = chunk[position >= boundary + 2] if boundary is not None else chunk.iloc[:0]
+            if engagement and not attendee.empty:
+                new_intervals.append(attendance_intervals(attendee, "Attendee"))
+            if new_intervals:
+                new = concat_intervals(new_intervals)
+                new = new[interval_seen.first_seen(_row_hashes(new))]
+                pending.append(new)
+                n_pending += len(new)
+                if n_pending >= max(MIN_FOLD_ROWS, 2 * len(blocks)):
+                    blocks = _fold_intervals(blocks, pending)
+                    pending, n_pending = [], 0
+            if attendee.empty:
+                continue
+            last_attendee = attendee.iloc[-1:]
+            duplicated_data += int((~row_seen.first_seen(_row_hashes(attendee))).sum())
+            non_volatile = attendee.drop(columns=VOLATILE_COLUMNS, errors="ignore")
+            keep = attendee_seen.first_seen(_row_hashes(non_volatile))
+            attendee = attendee[keep]
+            attendees.append(attendee)
+            _tally_countries(countries, attendee)
+
+        if pending:
+            blocks = _fold_intervals(blocks, pending)
+        stage["rows_in"] = start
+        stage["rows_out"] = sum(map(len, panelists)) + sum(map(len, attendees))
+
+    if boundary is None:
+        return empty
+
+    joins = blocks["Join Time"] if engagement else pd.Series(first_joins, dtype="datetime64[ns]")
+    Date = export_date(Start, joins, last_row['Join Time'].iloc[0])
+    df_engagement = webinar_engagement(blocks, Topic, Date, metrics) if engagement else pd.DataFrame()
+    if not engagement:
+        blocks = pd.DataFrame()
+
+    df_panelist = _with_role(panelists, columns, "Panelist")
+    df_attendee_clean = _with_role(attendees, columns, "Attendee")
+    df_clean = pd.concat([df_panelist, df_attendee_clean], ignore_index=True)
+
+    total_panelist = len(df_panelist)
+    total_attendee = len(df_attendee_clean)
+
+    df_t = country_long(countries, Date, Topic)
+
+    categorize(df_clean)
+
+    new_data = summary_row(Date, Topic, total_attendee, total_panelist, duplicated_data, "Webinar")
+
+    if last_attendee is None:
+        last_attendee = pd.DataFrame(columns=columns)
+    with metrics.stage("email", rows_in=len(df_clean)) as stage:
+        df_email = email_level_from_sections(df_panelist, last_attendee, df_attendee_clean, Topic, Date)
+        stage["rows_out"] = len(df_email)
+
+    return new_data, df_clean, df_t, df_email, blocks, df_engagement
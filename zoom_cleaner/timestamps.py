@@ -0,0 +1,140 @@
+"""Typed parsing of Zoom time columns.
+
+Zoom writes times as text in a handful of layouts that differ between
+report types and account settings (``2025-09-26 19:00:00``,
+``09/26/2025 07:00:00 PM``, ``Sep 26, 2025 07:00 PM``...). :func:`time_format`
+works out the layout of a value once and caches it by the value's *shape*
+(digits and letters blanked out), so a column is then parsed in one
+vectorized ``pd.to_datetime`` call with an explicit format instead of
+per-value inference. Values that do not fit (section header rows, blanks)
+become ``NaT``.
+
+Parsed times are naive wall-clock times in :data:`REPORT_TZ` (WIB), the zone
+our Zoom account writes its exports in and the one reports are dated in.
+:func:`session_date` gives the ``Date`` key of a session: the WIB day it
+started, so a webinar running past midnight keeps one date.
+
+The parsers take export times as written and never pass ``source_tz``:
+exports from an account set to another zone are dated by that zone's clock,
+not converted to WIB. ``source_tz`` is there for callers that know better.
+"""
+import re
+from datetime import timedelta, timezone
+
+import pandas as pd
+
+
+REPORT_TZ = timezone(timedelta(hours=7))  # WIB
+
+# Layouts seen in Zoom exports, tried in order for a new shape. Month-first
+# only: Zoom does not write day-first dates.
+ZOOM_TIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%b %d, %Y %I:%M:%S %p",
+    "%b %d, %Y %I:%M %p",
+    "%b %d, %Y %H:%M:%S",
+    "%b %d, %Y %H:%M",
+)
+
+# How many distinct values to try before giving up on finding a layout
+SAMPLE_VALUES = 16
+
+_SHAPE = re.compile(r"\d|[A-Za-z]")
+_format_cache = {}
+
+
+def _shape(text):
+    return _SHAPE.sub(lambda m: "0" if m.group().isdigit() else "a", text)
+
+
+def time_format(value):
+    """The :data:`ZOOM_TIME_FORMATS` entry ``value`` is written in, or ``None``.
+
+    Cached by the shape of ``value``, so only the first value of each layout
+    is tried against the formats.
+    """
+    shape = _shape(value)
+    try:
+        return _format_cache[shape]
+    except KeyError:
+        pass
+    fmt = None
+    for candidate in ZOOM_TIME_FORMATS:
+        try:
+            parsed = pd.to_datetime(value, format=candidate)
+        except (ValueError, TypeError):
+            continue
+        if not pd.isna(parsed):
+            fmt = candidate
+            break
+    _format_cache[shape] = fmt
+    return fmt
+
+
+def _localize(times, source_tz):
+    if source_tz is None or source_tz == REPORT_TZ:
+        return times
+    return times.dt.tz_localize(source_tz).dt.tz_convert(REPORT_TZ).dt.tz_localize(None)
+
+
+def parse_times(values, source_tz=None):
+    """Parse a column of Zoom times into naive WIB ``datetime64`` values.
+
+    The layout is taken from the first values that match a known format and
+    the whole column is parsed with it; anything else becomes ``NaT``. Times
+    written in another zone are converted when ``source_tz`` is given.
+    Columns in no known layout fall back to pandas' own inference.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return _localize(pd.Series(values, copy=False), source_tz)
+    values = pd.Series(values, dtype=object, copy=False)
+    fmt = None
+    for sample in values.dropna().head(SAMPLE_VALUES):
+        fmt = time_format(str(sample))
+        if fmt is not None:
+            break
+    times = pd.to_datetime(values, format=fmt or "mixed", errors="coerce")
+    return _localize(times, source_tz)
+
+
+def parse_time(value, source_tz=None):
+    """Parse a single Zoom time; ``NaT`` when it is missing or unreadable."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return pd.NaT
+    return parse_times([value], source_tz).iloc[0]
+
+
+def session_date(start=None, joins=None):
+    """``YYYY-MM-DD`` reporting date of a session, or ``None``.
+
+    The day of ``start`` (the export's start time) when known, else the day
+    of the earliest of ``joins``. Using the start rather than the last
+    join keeps sessions that run past midnight WIB on their first day.
+    Both are assumed to be WIB already (see the module notes on ``source_tz``).
+    """
+    if start is None or pd.isna(start):
+        start = joins.min() if joins is not None and len(joins) else pd.NaT
+    if pd.isna(start):
+        return None
+    return start.strftime("%Y-%m-%d")
+
+
+def export_date(start=None, joins=None, last_join=None):
+    """``Date`` key of a webinar export, or ``None``.
+
+    :func:`session_date` of the start time or, failing that, of ``joins``
+    (raw or parsed; only parsed when the start is unknown). When neither
+    gives a date, the date part of ``last_join``, the export's last Join
+    Time cell, as written. Times are taken as WIB (see the module notes).
+    """
+    if (start is None or pd.isna(start)) and joins is not None:
+        joins = parse_times(joins)
+    date = session_date(start, joins)
+    if date is None and isinstance(last_join, str):
+        return last_join[0:10]
+    return date
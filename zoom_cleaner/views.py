@@ -0,0 +1,81 @@
+"""Filtering and paging of result tables for display.
+
+The email-level table can have hundreds of thousands of rows; sending it
+whole to the browser freezes the page. :func:`filter_rows` narrows it on the
+server and :func:`page_of` cuts out the rows of one page, so a viewer only
+ever renders ``page_size`` rows. Categorical columns are matched on their
+categories and codes rather than row by row.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PAGE_SIZE = 100
+
+# filter argument -> column of the email-level table
+FILTER_COLUMNS = {
+    "topics": "Topic",
+    "dates": "Date",
+    "roles": "Role",
+    "countries": "Country/Region Name",
+}
+
+
+def column_values(df, column):
+    """Distinct non-missing values of ``column``, sorted, for filter widgets."""
+    if df.empty or column not in df.columns:
+        return []
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.remove_unused_categories().cat.categories
+    else:
+        values = series.dropna().unique()
+    return sorted(str(v) for v in values)
+
+
+def _isin(series, values):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        wanted = series.cat.categories.astype(str).isin(values)
+        codes = series.cat.codes.to_numpy()
+        return (codes >= 0) & wanted[codes]
+    return series.astype(str).isin(values).to_numpy()
+
+
+def _contains(series, text):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str)
+        wanted = categories.str.contains(text, case=False, regex=False).to_numpy(bool)
+        codes = series.cat.codes.to_numpy()
+        return (codes >= 0) & wanted[codes]
+    return series.astype(str).str.contains(text, case=False, regex=False, na=False).to_numpy()
+
+
+def filter_rows(df, topics=None, dates=None, roles=None, countries=None, email=None):
+    """Rows of ``df`` matching every given filter.
+
+    List filters keep rows whose column value is one of the values; empty or
+    ``None`` filters are ignored. ``email`` is a case-insensitive substring.
+    """
+    if df.empty:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for arg, values in (("topics", topics), ("dates", dates), ("roles", roles), ("countries", countries)):
+        column = FILTER_COLUMNS[arg]
+        if values and column in df.columns:
+            mask &= _isin(df[column], [str(v) for v in values])
+    if email and "Email" in df.columns:
+        mask &= _contains(df["Email"], email.strip())
+    return df if mask.all() else df[mask]
+
+
+def page_count(n_rows, page_size=DEFAULT_PAGE_SIZE):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def page_of(df, page, page_size=DEFAULT_PAGE_SIZE):
+    """Rows of 1-based ``page``, clamped to the available pages."""
+    page = min(max(1, int(page)), page_count(len(df), page_size))
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]